@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class AuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'authentication'
+
+    def ready(self):
+        """ Register the OpenAPI extension when the schema is served """
+        if 'drf_spectacular' in settings.INSTALLED_APPS:
+            from . import schema  # noqa: F401
@@ -0,0 +1,16 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .revocation import revoked_tokens
+
+
+class RevocableJWTAuthentication(JWTAuthentication):
+    """ JWT authentication rejecting revoked tokens """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if token.get(api_settings.JTI_CLAIM) in revoked_tokens:
+            raise InvalidToken(_("Token has been revoked"))
+        return token
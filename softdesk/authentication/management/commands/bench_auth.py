@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authentication.authentication import RevocableJWTAuthentication
+from authentication.models import CustomUser, RevokedToken
+from authentication.revocation import revoked_tokens
+
+
+class TableLookupJWTAuthentication(JWTAuthentication):
+    """ Revocation checked with one query per request, for comparison """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        RevokedToken.objects.filter(jti=token['jti']).exists()
+        return token
+
+
+class Command(BaseCommand):
+    help = "Benchmark the authentication overhead per request"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--revoked', type=int, default=10000,
+                            help="Number of revoked tokens in the table")
+
+    def measure(self, authentication, request, count):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for _ in range(count):
+                authentication.authenticate(Request(request))
+            elapsed = time.perf_counter() - start
+        return elapsed / count * 1e6, len(queries) / count
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        # Rows are created in a transaction rolled back at the end
+        with transaction.atomic():
+            user = CustomUser.objects.create(username='bench-auth-user',
+                                             age=30)
+            expires = AccessToken.for_user(user).current_time
+            RevokedToken.objects.bulk_create(
+                RevokedToken(jti=f'bench-{index}', expires_at=expires
+                             + AccessToken.lifetime)
+                for index in range(options['revoked']))
+            revoked_tokens.sync(force=True)
+            request = RequestFactory().get(
+                '/projects/',
+                HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+
+            self.stdout.write(f"{'authentication':<26}"
+                              f"{'us/request':>12}{'queries':>9}")
+            for name, authentication in (
+                    ('jwt, no revocation', JWTAuthentication()),
+                    ('jwt + table lookup', TableLookupJWTAuthentication()),
+                    ('jwt + bloom filter', RevocableJWTAuthentication())):
+                micros, queries = self.measure(authentication, request,
+                                               count)
+                self.stdout.write(f"{name:<26}{micros:>12.1f}"
+                                  f"{queries:>9.2f}")
+            transaction.set_rollback(True)
+        revoked_tokens.reset()
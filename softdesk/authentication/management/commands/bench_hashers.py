@@ -0,0 +1,63 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory, override_settings
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from authentication.models import CustomUser
+
+PASSWORD = 'bench-password-42'
+
+
+class Command(BaseCommand):
+    help = ("Benchmark hashing time and TokenObtainPairView login latency "
+            "for each configured password hasher")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=5,
+                            help="Number of logins measured per hasher")
+
+    def login_latency(self, encoded, rounds):
+        """ Time logins of a throwaway user, rolled back afterwards """
+        view = TokenObtainPairView.as_view()
+        factory = RequestFactory()
+        timings = []
+        with transaction.atomic():
+            CustomUser.objects.create(username='bench-hasher-user',
+                                      password=encoded, age=30)
+            for _ in range(rounds):
+                request = factory.post(
+                    '/api/token/',
+                    {'username': 'bench-hasher-user', 'password': PASSWORD},
+                    content_type='application/json')
+                start = time.perf_counter()
+                response = view(request)
+                timings.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.data
+            transaction.set_rollback(True)
+        return sorted(timings)[len(timings) // 2]
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'hasher':<16}{'hash ms':>10}{'login ms':>10}")
+        for path in settings.PASSWORD_HASHERS:
+            algorithm = import_string(path).algorithm
+            try:
+                start = time.perf_counter()
+                encoded = make_password(PASSWORD, hasher=algorithm)
+                hash_ms = (time.perf_counter() - start) * 1000
+            except ValueError as exc:
+                self.stdout.write(f"{algorithm:<16}skipped: {exc}")
+                continue
+
+            # Make it the preferred hasher so logins do not rehash
+            hashers = [path] + [other for other in settings.PASSWORD_HASHERS
+                                if other != path]
+            with override_settings(PASSWORD_HASHERS=hashers):
+                login_ms = self.login_latency(encoded,
+                                              options['rounds']) * 1000
+            self.stdout.write(
+                f"{algorithm:<16}{hash_ms:>10.1f}{login_ms:>10.1f}")
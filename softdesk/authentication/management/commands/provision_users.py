@@ -0,0 +1,40 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.serializers import ProvisionUserSerializer
+
+
+class Command(BaseCommand):
+    help = ("Create users from a CSV file with the columns username, "
+            "first_name, last_name, age, can_be_contacted, "
+            "can_data_be_shared and password")
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file')
+        parser.add_argument('--hasher', default='default',
+                            help="Password hasher algorithm, e.g. argon2")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Number of processes hashing passwords")
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Number of users validated and inserted "
+                                 "at once")
+
+    def handle(self, *args, **options):
+        context = {'hasher': options['hasher'],
+                   'workers': options['workers']}
+        created = 0
+        with open(options['csv_file'], newline='') as csv_file:
+            rows = list(csv.DictReader(csv_file))
+
+        for start in range(0, len(rows), options['batch_size']):
+            batch = rows[start:start + options['batch_size']]
+            serializer = ProvisionUserSerializer(data=batch, many=True,
+                                                 context=context)
+            if not serializer.is_valid():
+                raise CommandError(
+                    f"Rows {start + 1}-{start + len(batch)}: "
+                    f"{serializer.errors}")
+            serializer.save()
+            created += len(batch)
+            self.stdout.write(f"{created}/{len(rows)} users created")
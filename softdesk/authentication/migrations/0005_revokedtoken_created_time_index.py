@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='revokedtoken',
+            name='created_time',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
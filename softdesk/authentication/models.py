@@ -14,3 +14,28 @@ class CustomUser(AbstractUser):
 
     def __str__(self):
         return self.username
+
+    def anonymize(self):
+        """ Detach the account from its personal data and disable it """
+        self.username = f'deleted-{self.pk}'
+        self.first_name = ''
+        self.last_name = ''
+        self.email = ''
+        self.is_active = False
+        self.can_be_contacted = False
+        self.can_data_be_shared = False
+        self.set_unusable_password()
+        self.save()
+
+
+class RevokedToken(models.Model):
+    """ Revoked JWT, kept until the token would have expired anyway """
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    created_time = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self):
+        return f'{self.jti} until {self.expires_at}'
@@ -0,0 +1,65 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+from .models import CustomUser
+
+# Below this number of passwords, starting processes costs more than it saves
+PARALLEL_THRESHOLD = 8
+
+
+def _init_worker():
+    """ Set Django up in processes started with the spawn method """
+    if not apps.ready:
+        django.setup()
+
+
+def _hash_chunk(args):
+    passwords, hasher = args
+    return [make_password(password, hasher=hasher) for password in passwords]
+
+
+def hash_passwords(passwords, hasher='default', workers=None):
+    """ Hash passwords across a pool of processes
+        Args:
+            passwords (list): raw passwords, None gives an unusable password
+            hasher (str): algorithm of the hasher, default is the first one
+                of PASSWORD_HASHERS
+            workers (int): number of processes, default is
+                PROVISIONING_WORKERS or the CPU count
+        Returns:
+            list: encoded passwords, in the same order
+    """
+    workers = workers or settings.PROVISIONING_WORKERS or os.cpu_count()
+    if workers == 1 or len(passwords) < PARALLEL_THRESHOLD:
+        return _hash_chunk((passwords, hasher))
+
+    size = max(1, len(passwords) // (workers * 4))
+    chunks = [(passwords[i:i + size], hasher)
+              for i in range(0, len(passwords), size)]
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_worker) as pool:
+        return [encoded for chunk in pool.map(_hash_chunk, chunks)
+                for encoded in chunk]
+
+
+def provision_users(rows, hasher='default', workers=None, batch_size=500):
+    """ Create users from validated rows with a single bulk insert per batch
+        Args:
+            rows (list): dicts of CustomUser fields, with a raw password
+            hasher (str): algorithm used to hash the passwords
+            workers (int): number of processes hashing the passwords
+            batch_size (int): number of users inserted per statement
+        Returns:
+            list: the created users
+    """
+    rows = [dict(row) for row in rows]
+    passwords = hash_passwords([row.pop('password', None) for row in rows],
+                               hasher=hasher, workers=workers)
+    users = [CustomUser(password=password, **row)
+             for row, password in zip(rows, passwords)]
+    return CustomUser.objects.bulk_create(users, batch_size=batch_size)
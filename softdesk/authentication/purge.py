@@ -0,0 +1,80 @@
+from django.utils import timezone
+
+from support.models import Project, Issue, Comment, ArchivedIssue, \
+    ArchivedComment
+from support.purge import PURGE_BATCH_SIZE, purge_project
+
+from .models import CustomUser
+
+
+def _detach_batch(queryset, field, batch_size):
+    """ Set field to NULL on at most batch_size rows of the queryset
+        Returns:
+            int: number of updated rows
+    """
+    ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+    if not ids:
+        return 0
+    queryset.model.objects.filter(pk__in=ids).update(**{field: None})
+    return len(ids)
+
+
+def purge_user(user_id, batch_size=PURGE_BATCH_SIZE):
+    """ Delete an anonymized user in bounded, resumable steps.
+        Authored projects are purged, live and archived issues and comments
+        are detached, memberships are removed, then the user row itself is
+        deleted. Each step only selects what is left to do, so a run
+        interrupted at any point can be started again.
+        Args:
+            user_id (int): id of the anonymized user
+            batch_size (int): maximum number of rows written per statement
+        Yields:
+            dict: progress with the number of rows handled so far
+    """
+    progress = {'user': user_id, 'projects': 0, 'issues': 0, 'comments': 0,
+                'memberships': 0, 'done': False}
+    if not CustomUser.objects.filter(pk=user_id, is_active=False).exists():
+        return
+
+    Project.objects.filter(author_id=user_id).update(
+        deleted_at=timezone.now())
+    project_ids = Project.all_objects.filter(
+        author_id=user_id).values_list('id', flat=True)
+    for project_id in list(project_ids):
+        for step in purge_project(project_id, batch_size):
+            yield dict(progress, purge=step)
+        progress['projects'] += 1
+
+    detach_steps = (
+        ('issues', Issue.objects.filter(author_id=user_id), 'author'),
+        ('issues', Issue.objects.filter(assigned_to_id=user_id),
+         'assigned_to'),
+        ('comments', Comment.objects.filter(author_id=user_id), 'author'),
+        ('issues', ArchivedIssue.objects.filter(author_id=user_id),
+         'author'),
+        ('issues', ArchivedIssue.objects.filter(assigned_to_id=user_id),
+         'assigned_to'),
+        ('comments', ArchivedComment.objects.filter(author_id=user_id),
+         'author'),
+    )
+    for key, queryset, field in detach_steps:
+        while True:
+            updated = _detach_batch(queryset, field, batch_size)
+            if not updated:
+                break
+            progress[key] += updated
+            yield dict(progress)
+
+    memberships = Project.contributors.through.objects.filter(
+        customuser_id=user_id)
+    while True:
+        ids = list(memberships.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            break
+        Project.contributors.through.objects.filter(pk__in=ids).delete()
+        progress['memberships'] += len(ids)
+        yield dict(progress)
+
+    CustomUser.objects.filter(pk=user_id).delete()
+    progress['done'] = True
+    yield dict(progress)
@@ -0,0 +1,107 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import RevokedToken
+
+
+class BloomFilter:
+    """ Fixed size set answering "maybe present" or "surely absent" """
+
+    def __init__(self, capacity, error_rate):
+        self.size = max(8, int(-capacity * math.log(error_rate)
+                               / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(value))
+
+
+class RevocationSet:
+    """ In memory view of the RevokedToken table.
+        Tokens absent from the bloom filter, nearly all of them, are
+        accepted without any query. New revocations are loaded every
+        TOKEN_REVOCATION_SYNC_SECONDS, and the filter is rebuilt every
+        TOKEN_REVOCATION_REBUILD_SECONDS to forget expired tokens.
+        Each synchronization reads again the revocations created in the
+        last sync_overlap, so a revocation committed late is not missed.
+    """
+    capacity = 100_000
+    error_rate = 0.01
+    sync_overlap = timedelta(seconds=60)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.bloom = None
+        self.synced_since = None
+        self.synced_at = 0.0
+        self.built_at = 0.0
+
+    def sync(self, force=False):
+        """ Load the tokens revoked since the last synchronization """
+        now = time.monotonic()
+        interval = settings.TOKEN_REVOCATION_SYNC_SECONDS
+        if (not force and self.bloom is not None
+                and now - self.synced_at < interval):
+            return
+        with self.lock:
+            started = timezone.now()
+            if (self.bloom is None or now - self.built_at
+                    >= settings.TOKEN_REVOCATION_REBUILD_SECONDS):
+                RevokedToken.objects.filter(expires_at__lte=started).delete()
+                # Fill the new filter before swapping it in, requests keep
+                # checking the previous one meanwhile
+                bloom = BloomFilter(self.capacity, self.error_rate)
+                self.load(bloom, started)
+                self.bloom = bloom
+                self.built_at = now
+            else:
+                self.load(self.bloom, started, since=self.synced_since)
+            self.synced_since = started - self.sync_overlap
+            self.synced_at = now
+
+    @staticmethod
+    def load(bloom, now, since=None):
+        """ Add the unexpired revocations created since the date """
+        revoked = RevokedToken.objects.filter(expires_at__gt=now)
+        if since is not None:
+            revoked = revoked.filter(created_time__gte=since)
+        for jti in revoked.values_list('jti', flat=True):
+            bloom.add(jti)
+
+    def revoke(self, jti, expires_at):
+        """ Store the revocation and apply it to this process at once """
+        RevokedToken.objects.get_or_create(
+            jti=jti, defaults={'expires_at': expires_at})
+        self.sync()
+        self.bloom.add(jti)
+
+    def __contains__(self, jti):
+        self.sync()
+        if jti not in self.bloom:
+            return False
+        # Maybe a false positive, the table has the final word
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+
+revoked_tokens = RevocationSet()
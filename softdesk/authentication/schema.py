@@ -0,0 +1,6 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class RevocableJWTScheme(SimpleJWTScheme):
+    """ Document RevocableJWTAuthentication like the JWT authentication """
+    target_class = 'authentication.authentication.RevocableJWTAuthentication'
@@ -1,8 +1,20 @@
+from datetime import datetime, timezone
+
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+
+from softdesk.serializers import UpdateFieldsModelSerializer
 from .models import CustomUser
+from .provisioning import provision_users
+from .revocation import revoked_tokens
 
 
-class CustomUserSerializer(serializers.ModelSerializer):
+class CustomUserSerializer(UpdateFieldsModelSerializer):
     """ Serializer for our custom user model """
     password = serializers.CharField(write_only=True, required=False)
 
@@ -37,6 +49,13 @@ class CustomUserSerializer(serializers.ModelSerializer):
 
         return user
 
+    def update(self, instance, validated_data):
+        """ Update the user, hashing a new password """
+        if 'password' in validated_data:
+            instance.set_password(validated_data.pop('password'))
+            validated_data['password'] = instance.password
+        return super().update(instance, validated_data)
+
     def validate_age(self, value):
         """ Validate the user age to be more than 15 years old """
         if value < 15:
@@ -45,3 +64,90 @@ class CustomUserSerializer(serializers.ModelSerializer):
             )
 
         return value
+
+
+class CustomUserReadSerializer(serializers.ModelSerializer):
+    """ Read only variant of CustomUserSerializer, for listings """
+
+    class Meta:
+        model = CustomUser
+        fields = [
+            'id',
+            'username',
+            'first_name',
+            'last_name',
+            'age',
+            'can_be_contacted',
+            'can_data_be_shared',
+        ]
+        read_only_fields = fields
+
+
+class ProvisionUserListSerializer(serializers.ListSerializer):
+    """ Validate and create a batch of users at once """
+
+    def validate(self, attrs):
+        """ Check usernames are unique with one query for the whole batch
+            Args:
+                attrs (list): validated attributes of each user
+        """
+        usernames = [item['username'] for item in attrs]
+        duplicates = {name for name in usernames if usernames.count(name) > 1}
+        taken = set(CustomUser.objects.filter(username__in=usernames)
+                    .values_list('username', flat=True))
+        if duplicates or taken:
+            raise serializers.ValidationError(
+                {"username": "These usernames are duplicated or already "
+                             f"taken: {', '.join(sorted(duplicates | taken))}"}
+            )
+        return attrs
+
+    def create(self, validated_data):
+        return provision_users(validated_data,
+                               hasher=self.context.get('hasher', 'default'),
+                               workers=self.context.get('workers'))
+
+
+class ProvisionUserSerializer(CustomUserSerializer):
+    """ Serializer for bulk user provisioning, the username uniqueness is
+        checked once for the batch by the list serializer """
+
+    class Meta(CustomUserSerializer.Meta):
+        list_serializer_class = ProvisionUserListSerializer
+        extra_kwargs = {
+            "age": {"required": True},
+            "username": {"validators": [UnicodeUsernameValidator()]},
+        }
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """ Refresh serializer rejecting revoked refresh tokens """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        if refresh.get(api_settings.JTI_CLAIM) in revoked_tokens:
+            raise InvalidToken(_("Token has been revoked"))
+        return super().validate(attrs)
+
+
+class TokenRevokeSerializer(serializers.Serializer):
+    """ Serializer revoking an access or refresh token of the user """
+    token = serializers.CharField(write_only=True)
+
+    def validate_token(self, value):
+        """ Only valid tokens of the requesting user can be revoked """
+        try:
+            token = UntypedToken(value)
+        except TokenError as error:
+            raise serializers.ValidationError(str(error))
+        user = self.context['request'].user
+        if str(token.get(api_settings.USER_ID_CLAIM)) != str(user.pk):
+            raise serializers.ValidationError(
+                "You can only revoke your own tokens.")
+        return token
+
+    def save(self):
+        token = self.validated_data['token']
+        revoked_tokens.revoke(
+            token[api_settings.JTI_CLAIM],
+            datetime.fromtimestamp(token['exp'], tz=timezone.utc))
@@ -0,0 +1,11 @@
+from jobs.registry import register
+from support.purge import PURGE_BATCH_SIZE
+
+from .purge import purge_user
+
+
+@register('authentication.purge_user')
+def purge_user_task(job):
+    """ Detach and delete the rows of an anonymized user """
+    yield from purge_user(job.payload['user_id'],
+                          job.payload.get('batch_size', PURGE_BATCH_SIZE))
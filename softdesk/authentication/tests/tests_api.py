@@ -2,6 +2,8 @@ from rest_framework.test import APITestCase
 from django.urls import reverse
 from rest_framework import status
 
+from jobs.models import Job
+from jobs.runner import run_pending
 from ..models import CustomUser
 
 
@@ -117,7 +119,23 @@ class CustomUserApiTest(APITestCase):
         self.client.force_authenticate(user=self.user2)
         user2_detail_url = reverse('user-detail', args=[self.user2.pk])
         response = self.client.delete(user2_detail_url)
-        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        user2 = CustomUser.objects.get(pk=self.user2.pk)
+        self.assertFalse(user2.is_active)
+        self.assertEqual(user2.username, f"deleted-{user2.pk}")
+        job = Job.objects.get(pk=response.data["id"])
+        self.assertEqual(job.name, 'authentication.purge_user')
+        self.assertIsNone(job.owner)
+
+        staff = CustomUser.objects.create(username="staff", age=40,
+                                          is_staff=True)
+        self.client.force_authenticate(user=staff)
+        response = self.client.get(reverse('job-detail', args=[job.pk]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(user=self.user2)
+
+        run_pending()
         self.assertFalse(CustomUser.objects.filter(pk=self.user2.pk).exists())
 
     def test_unknown_user(self):
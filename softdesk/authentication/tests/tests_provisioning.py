@@ -0,0 +1,74 @@
+from django.contrib.auth.hashers import check_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import CustomUser
+from ..provisioning import hash_passwords
+
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+def user_rows(count, prefix="bulk"):
+    return [{
+        "username": f"{prefix}-{index}",
+        "first_name": "Bulk",
+        "last_name": f"User {index}",
+        "age": 20 + index,
+        "can_be_contacted": False,
+        "can_data_be_shared": False,
+        "password": f"pass-{index}",
+    } for index in range(count)]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class HashPasswordsTest(TestCase):
+    """ Tests for parallel password hashing """
+
+    def test_hash_passwords_in_process_pool(self):
+        passwords = [f"pass-{index}" for index in range(8)] + [None]
+        encoded = hash_passwords(passwords, hasher='md5', workers=2)
+
+        self.assertEqual(len(encoded), 9)
+        for password, hashed in zip(passwords[:-1], encoded):
+            self.assertTrue(hashed.startswith('md5$'))
+            self.assertTrue(check_password(password, hashed))
+        self.assertTrue(encoded[-1].startswith('!'))
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class ProvisionUsersApiTest(APITestCase):
+    """ Tests for the bulk user provisioning endpoint """
+    def setUp(self):
+        self.url = reverse('user-provision')
+        self.admin = CustomUser.objects.create(username="admin", age=40,
+                                               is_staff=True)
+        self.user = CustomUser.objects.create(username="user1", age=21)
+
+    def test_provision_users(self):
+        self.client.force_authenticate(user=self.admin)
+        with self.assertNumQueries(2):
+            response = self.client.post(self.url, user_rows(3),
+                                        format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 3)
+        user = CustomUser.objects.get(username="bulk-2")
+        self.assertEqual(user.age, 22)
+        self.assertTrue(user.check_password("pass-2"))
+
+    def test_provision_users_rejects_taken_usernames(self):
+        self.client.force_authenticate(user=self.admin)
+        rows = user_rows(2) + user_rows(1, prefix="user1")
+        rows[-1]["username"] = "user1"
+        response = self.client.post(self.url, rows, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(CustomUser.objects.filter(
+            username__startswith="bulk").exists())
+
+    def test_provision_users_requires_staff(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url, user_rows(1), format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
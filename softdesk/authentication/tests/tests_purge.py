@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from support.archive import archive_issues
+from support.models import Project, Issue, Comment, ArchivedIssue, \
+    ArchivedComment
+from ..models import CustomUser
+from ..purge import purge_user
+
+
+class PurgeUserTest(TestCase):
+    """ Tests for the chunked cleanup of deleted accounts """
+    def setUp(self):
+        self.user1 = CustomUser.objects.create_user(
+            username="user1",
+            password="pass123",
+            first_name="John",
+            last_name="Doe",
+            age=21,
+        )
+        self.user2 = CustomUser.objects.create_user(
+            username="user2",
+            password="pass123",
+            first_name="Jane",
+            last_name="Doe",
+            age=19,
+        )
+        self.own_project = Project.objects.create(
+            author=self.user1, name="own", description="own",
+            type="backend")
+        self.own_project.contributors.add(self.user1)
+        self.other_project = Project.objects.create(
+            author=self.user2, name="other", description="other",
+            type="backend")
+        self.other_project.contributors.add(self.user1, self.user2)
+        self.issue = Issue.objects.create(
+            author=self.user1, assigned_to=self.user1, name="Issue",
+            description="Issue", priority="low", type="bug",
+            project=self.other_project)
+        for _ in range(3):
+            Comment.objects.create(author=self.user1, issue=self.issue,
+                                   description="Comment")
+
+    def test_purge_user_detaches_rows(self):
+        self.user1.anonymize()
+        steps = list(purge_user(self.user1.pk, batch_size=2))
+
+        self.assertTrue(steps[-1]["done"])
+        self.assertEqual(steps[-1]["comments"], 3)
+        self.assertEqual(steps[-1]["projects"], 1)
+        self.assertFalse(CustomUser.objects.filter(pk=self.user1.pk).exists())
+        self.assertFalse(
+            Project.all_objects.filter(pk=self.own_project.pk).exists())
+
+        self.issue.refresh_from_db()
+        self.assertIsNone(self.issue.author)
+        self.assertIsNone(self.issue.assigned_to)
+        self.assertEqual(Comment.objects.filter(issue=self.issue).count(), 3)
+        self.assertEqual(list(self.other_project.contributors.all()),
+                         [self.user2])
+
+    def test_purge_user_detaches_archived_rows(self):
+        Issue.objects.filter(pk=self.issue.pk).update(
+            status="finished",
+            created_time=timezone.now() - timedelta(days=400))
+        Comment.objects.filter(issue=self.issue).update(
+            created_time=timezone.now() - timedelta(days=400))
+        list(archive_issues(timezone.now() - timedelta(days=180)))
+        self.user1.anonymize()
+        steps = list(purge_user(self.user1.pk, batch_size=2))
+
+        self.assertTrue(steps[-1]["done"])
+        self.assertEqual(steps[-1]["issues"], 2)
+        self.assertEqual(steps[-1]["comments"], 3)
+        self.assertFalse(CustomUser.objects.filter(pk=self.user1.pk).exists())
+        archived = ArchivedIssue.objects.get(pk=self.issue.pk)
+        self.assertIsNone(archived.author)
+        self.assertIsNone(archived.assigned_to)
+        self.assertFalse(ArchivedComment.objects.filter(
+            author__isnull=False).exists())
+        self.assertEqual(ArchivedComment.objects.count(), 3)
+
+    def test_purge_user_is_resumable(self):
+        self.user1.anonymize()
+        steps = purge_user(self.user1.pk, batch_size=1)
+        for _ in range(3):
+            next(steps)
+        steps.close()
+
+        list(purge_user(self.user1.pk, batch_size=1))
+        self.assertFalse(CustomUser.objects.filter(pk=self.user1.pk).exists())
+        self.assertTrue(Project.objects.filter(
+            pk=self.other_project.pk).exists())
+
+    def test_purge_ignores_active_user(self):
+        list(purge_user(self.user1.pk))
+        self.assertTrue(CustomUser.objects.filter(pk=self.user1.pk).exists())
@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from ..models import CustomUser, RevokedToken
+from ..revocation import BloomFilter, revoked_tokens
+
+
+class BloomFilterTest(TestCase):
+    """ Tests for the bloom filter behind the revocation set """
+
+    def test_no_false_negative(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        values = [f"jti-{index}" for index in range(1000)]
+        for value in values:
+            bloom.add(value)
+        self.assertTrue(all(value in bloom for value in values))
+
+        false_positives = sum(f"other-{index}" in bloom
+                              for index in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class TokenRevocationApiTest(APITestCase):
+    """ Tests for token revocation """
+    def setUp(self):
+        revoked_tokens.reset()
+        self.addCleanup(revoked_tokens.reset)
+        self.user1 = CustomUser.objects.create(username="user1", age=21)
+        self.user2 = CustomUser.objects.create(username="user2", age=19)
+        self.refresh = RefreshToken.for_user(self.user1)
+        self.access = self.refresh.access_token
+
+    def authenticate(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_valid_token_costs_no_revocation_query(self):
+        self.authenticate(self.access)
+        revoked_tokens.sync(force=True)
+        # The user fetch of the JWT authentication and the retrieved user
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse('user-detail', args=[self.user1.pk]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_revoke_access_token(self):
+        self.authenticate(self.access)
+        response = self.client.post(reverse('token_revoke'),
+                                    {"token": str(self.access)})
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.get(reverse('user-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.authenticate(RefreshToken.for_user(self.user1).access_token)
+        response = self.client.get(reverse('user-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_revoke_refresh_token(self):
+        self.authenticate(self.access)
+        self.client.post(reverse('token_revoke'),
+                         {"token": str(self.refresh)})
+        response = self.client.post(reverse('token_refresh'),
+                                    {"refresh": str(self.refresh)})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cannot_revoke_token_of_another_user(self):
+        self.authenticate(RefreshToken.for_user(self.user2).access_token)
+        response = self.client.post(reverse('token_revoke'),
+                                    {"token": str(self.access)})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(RevokedToken.objects.exists())
+
+    def test_revocation_from_another_worker_is_synced(self):
+        self.authenticate(self.access)
+        revoked_tokens.sync(force=True)
+        RevokedToken.objects.create(
+            jti=self.access['jti'],
+            expires_at=timezone.now() + timedelta(minutes=5))
+        revoked_tokens.sync(force=True)
+
+        response = self.client.get(reverse('user-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_committed_out_of_id_order_is_synced(self):
+        expires_at = timezone.now() + timedelta(minutes=5)
+        RevokedToken.objects.create(id=10, jti='later-id',
+                                    expires_at=expires_at)
+        revoked_tokens.sync(force=True)
+        # A concurrent transaction with a lower id commits afterwards
+        RevokedToken.objects.create(id=5, jti='earlier-id',
+                                    expires_at=expires_at)
+        revoked_tokens.sync(force=True)
+
+        self.assertIn('earlier-id', revoked_tokens)
@@ -1,11 +1,22 @@
 from django.contrib.auth import get_user_model
 from django.views.defaults import permission_denied
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from django.conf import settings
+from django.db import transaction
+from rest_framework.permissions import IsAuthenticated, AllowAny, \
+    IsAdminUser
 from drf_spectacular.utils import extend_schema_view, extend_schema
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 
-from .serializers import CustomUserSerializer
+from jobs.models import Job
+from jobs.serializers import JobSerializer
+from support.idempotency import IdempotentPostMixin
+from .serializers import CustomUserSerializer, ProvisionUserSerializer, \
+    TokenRevokeSerializer
 
 User = get_user_model()
 
@@ -15,24 +26,34 @@ User = get_user_model()
     create=extend_schema(summary="Create a user", tags=["Users"]),
     retrieve=extend_schema(summary="Get user details", tags=["Users"]),
     update=extend_schema(summary="Update a user", tags=["Users"]),
-    destroy=extend_schema(summary="Delete a user", tags=["Users"]),
+    partial_update=extend_schema(summary="Partially update a user",
+                                 tags=["Users"]),
+    destroy=extend_schema(summary="Delete a user", tags=["Users"],
+                          responses={202: JobSerializer}),
+    provision=extend_schema(summary="Create users in bulk", tags=["Users"],
+                            request=ProvisionUserSerializer(many=True),
+                            responses={201: ProvisionUserSerializer(
+                                many=True)}),
 )
-class CustomUserViewSet(ModelViewSet):
+class CustomUserViewSet(IdempotentPostMixin, ModelViewSet):
     """ ViewSet for viewing and editing user """
-    http_method_names = ['get', 'post', 'put', 'delete']
+    http_method_names = ['get', 'post', 'put', 'patch', 'delete']
     queryset = User.objects.all()
     serializer_class = CustomUserSerializer
+    throttle_scope = 'users'
 
     def get_permissions(self):
         """ Return permissions based on action """
         if self.action in ['create']:
             permission_classes = [AllowAny]
+        elif self.action in ['provision']:
+            permission_classes = [IsAuthenticated, IsAdminUser]
         else:
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
 
     def get_queryset(self):
-        return User.objects.filter(is_staff=False)
+        return User.objects.filter(is_staff=False, is_active=True)
 
     def get_object(self):
         obj = super().get_object()
@@ -40,3 +61,45 @@ class CustomUserViewSet(ModelViewSet):
             raise PermissionDenied("You are not authorized to update or "
                                    "delete another user account.")
         return obj
+
+    def destroy(self, request, *args, **kwargs):
+        """ Anonymize the user and return the cleanup job """
+        job = self.perform_destroy(self.get_object())
+        return Response(JobSerializer(job).data,
+                        status=status.HTTP_202_ACCEPTED)
+
+    def perform_destroy(self, instance):
+        """ Anonymize the user, related rows are cleaned up in background.
+            The anonymized user can no longer authenticate, so the job has
+            no owner: staff members follow it by its id. """
+        with transaction.atomic():
+            instance.anonymize()
+            return Job.objects.enqueue('authentication.purge_user',
+                                       user_id=instance.pk)
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def provision(self, request):
+        """ Create a batch of users, hashing passwords in parallel """
+        if (not isinstance(request.data, list)
+                or len(request.data) > settings.PROVISIONING_MAX_USERS):
+            raise ValidationError(
+                "Expected a list of at most "
+                f"{settings.PROVISIONING_MAX_USERS} users.")
+        serializer = ProvisionUserSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+@extend_schema(summary="Revoke a token", tags=["Authentication"],
+               responses={204: None})
+class TokenRevokeView(IdempotentPostMixin, GenericAPIView):
+    """ Revoke an access or refresh token before it expires """
+    serializer_class = TokenRevokeSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(status=status.HTTP_204_NO_CONTENT)
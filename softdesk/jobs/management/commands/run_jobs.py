@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.runner import run_pending
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help="Drain the queue once then exit")
+        parser.add_argument('--sleep', type=float, default=1.0,
+                            help="Seconds to wait when the queue is empty")
+        parser.add_argument('--max-jobs', type=int, default=None,
+                            help="Exit after running this number of jobs")
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            remaining = None
+            if options['max_jobs'] is not None:
+                remaining = options['max_jobs'] - total
+            count = run_pending(max_jobs=remaining)
+            total += count
+            if count:
+                self.stdout.write(f"{count} job(s) run")
+            if options['once'] or (remaining is not None
+                                   and total >= options['max_jobs']):
+                break
+            if not count:
+                time.sleep(options['sleep'])
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class JobManager(models.Manager):
+    """ Manager for background jobs """
+
+    def enqueue(self, name, owner=None, **payload):
+        """ Queue a job for the worker
+            Args:
+                name (str): name of a registered handler
+                owner (CustomUser): user allowed to follow the job
+                payload: JSON serializable arguments of the handler
+            Returns:
+                Job: the pending job
+        """
+        return self.create(name=name, owner=owner, payload=payload)
+
+
+class Job(models.Model):
+    """ Job model, a unit of work run outside of the request thread """
+    STATUS_CHOICES = (
+        ('pending', 'pending'),
+        ('running', 'running'),
+        ('succeeded', 'succeeded'),
+        ('failed', 'failed'),
+    )
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES,
+                              default='pending')
+    progress = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    owner = models.ForeignKey(to=settings.AUTH_USER_MODEL,
+                              on_delete=models.SET_NULL, null=True,
+                              blank=True, related_name='jobs')
+    created_time = models.DateTimeField(auto_now_add=True)
+    updated_time = models.DateTimeField(auto_now=True)
+
+    objects = JobManager()
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [models.Index(fields=['status', 'run_after'])]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
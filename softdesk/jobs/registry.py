@@ -0,0 +1,21 @@
+_handlers = {}
+
+
+def register(name):
+    """ Decorator registering a job handler under the given name.
+        A handler receives the Job instance. It may return a dict, stored
+        as the job progress, or yield dicts to report progress while it
+        runs.
+    """
+    def decorator(func):
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+def get_handler(name):
+    """ Return the handler registered under name
+        Raises:
+            KeyError: no handler is registered under this name
+    """
+    return _handlers[name]
@@ -0,0 +1,106 @@
+import inspect
+import traceback
+from datetime import timedelta
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_handler
+
+RETRY_BASE_DELAY = 2
+# A running job is owned by its worker until the lease expires, every
+# progress report renews it. A job whose worker died is claimed again once
+# its lease has expired.
+LEASE_DURATION = timedelta(minutes=10)
+
+
+def _claimable(now):
+    """ Due pending jobs and running jobs abandoned by their worker """
+    return (Q(status='pending', run_after__lte=now)
+            | Q(status='running', lease_expires_at__lt=now,
+                attempts__lt=F('max_attempts')))
+
+
+def fail_expired():
+    """ Fail the abandoned running jobs without attempts left
+        Returns:
+            int: number of failed jobs
+    """
+    now = timezone.now()
+    return (Job.objects
+            .filter(status='running', lease_expires_at__lt=now,
+                    attempts__gte=F('max_attempts'))
+            .update(status='failed', error='Lease expired, the worker '
+                                           'running the job stopped.',
+                    lease_expires_at=None, updated_time=now))
+
+
+def claim_next():
+    """ Atomically move the oldest due job to the running state, with a
+        lease of LEASE_DURATION
+        Returns:
+            Job | None: the claimed job, None when the queue is empty
+    """
+    fail_expired()
+    now = timezone.now()
+    candidates = (Job.objects.filter(_claimable(now))
+                  .values_list('pk', flat=True)[:10])
+    for pk in candidates:
+        claimed = (Job.objects.filter(_claimable(now), pk=pk)
+                   .update(status='running', attempts=F('attempts') + 1,
+                           lease_expires_at=now + LEASE_DURATION,
+                           updated_time=now))
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def _save_progress(job, progress):
+    job.progress = progress
+    job.lease_expires_at = timezone.now() + LEASE_DURATION
+    job.save(update_fields=['progress', 'lease_expires_at', 'updated_time'])
+
+
+def run_job(job):
+    """ Run a claimed job and record its outcome.
+        A failing job goes back to the queue with an exponential delay
+        until max_attempts is reached. A handler running longer than
+        LEASE_DURATION must yield progress to keep its lease.
+    """
+    try:
+        result = get_handler(job.name)(job)
+        if inspect.isgenerator(result):
+            for progress in result:
+                _save_progress(job, progress)
+        elif result is not None:
+            job.progress = result
+        job.status = 'succeeded'
+        job.error = ''
+    except Exception:
+        job.error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = 'pending'
+            job.run_after = timezone.now() + timedelta(
+                seconds=RETRY_BASE_DELAY ** job.attempts)
+        else:
+            job.status = 'failed'
+    job.lease_expires_at = None
+    job.save(update_fields=['status', 'progress', 'error', 'run_after',
+                            'lease_expires_at', 'updated_time'])
+    return job
+
+
+def run_pending(max_jobs=None):
+    """ Run due jobs until the queue is empty or max_jobs were run
+        Returns:
+            int: number of jobs run
+    """
+    count = 0
+    while max_jobs is None or count < max_jobs:
+        job = claim_next()
+        if job is None:
+            break
+        run_job(job)
+        count += 1
+    return count
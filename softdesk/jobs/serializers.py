@@ -0,0 +1,21 @@
+from rest_framework import serializers
+
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """ Serializer for job model """
+
+    class Meta:
+        model = Job
+        fields = [
+            'id',
+            'name',
+            'status',
+            'progress',
+            'error',
+            'attempts',
+            'created_time',
+            'updated_time',
+        ]
+        read_only_fields = fields
@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import Job
+from ..registry import register
+from ..runner import claim_next, run_pending
+
+User = get_user_model()
+
+
+@register('tests.progress')
+def progress_task(job):
+    for step in range(job.payload['steps']):
+        yield {'step': step + 1}
+
+
+@register('tests.failing')
+def failing_task(job):
+    raise ValueError("boom")
+
+
+class JobRunnerTest(APITestCase):
+    """ Tests for the background job queue """
+    def setUp(self):
+        self.user1 = User.objects.create_user(
+            username="user1",
+            password="pass123",
+            first_name="user1",
+            last_name="Test",
+            age=23
+        )
+        self.user2 = User.objects.create_user(
+            username="user2",
+            password="pass123",
+            first_name="user2",
+            last_name="Test",
+            age=33
+        )
+
+    def test_run_job_records_progress(self):
+        job = Job.objects.enqueue('tests.progress', owner=self.user1,
+                                  steps=3)
+        self.assertEqual(run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(job.progress, {'step': 3})
+        self.assertEqual(job.attempts, 1)
+
+    def test_failing_job_is_retried_then_failed(self):
+        job = Job.objects.enqueue('tests.failing')
+        job.max_attempts = 2
+        job.save()
+
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'pending')
+        self.assertIn("boom", job.error)
+        self.assertGreater(job.run_after, job.created_time)
+
+        Job.objects.filter(pk=job.pk).update(run_after=job.created_time)
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.attempts, 2)
+
+    def test_claimed_job_is_not_claimed_twice(self):
+        Job.objects.enqueue('tests.progress', steps=1)
+        self.assertIsNotNone(claim_next())
+        self.assertIsNone(claim_next())
+
+    def test_abandoned_job_is_claimed_again(self):
+        job = Job.objects.enqueue('tests.progress', steps=1)
+        claim_next()
+        Job.objects.filter(pk=job.pk).update(
+            lease_expires_at=timezone.now() - timedelta(seconds=1))
+
+        claimed = claim_next()
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.attempts, 2)
+        self.assertGreater(claimed.lease_expires_at, timezone.now())
+
+    def test_abandoned_job_without_attempts_left_fails(self):
+        job = Job.objects.enqueue('tests.progress', steps=1)
+        Job.objects.filter(pk=job.pk).update(max_attempts=1)
+        claim_next()
+        Job.objects.filter(pk=job.pk).update(
+            lease_expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertIsNone(claim_next())
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertIn("Lease expired", job.error)
+
+    def test_job_status_owner_only(self):
+        job = Job.objects.enqueue('tests.progress', owner=self.user1,
+                                  steps=1)
+        url = reverse('job-detail', args=[job.pk])
+
+        self.client.force_authenticate(user=self.user1)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "pending")
+
+        self.client.force_authenticate(user=self.user2)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,20 @@
+from drf_spectacular.utils import extend_schema_view, extend_schema
+from rest_framework.viewsets import ReadOnlyModelViewSet
+
+from .models import Job
+from .serializers import JobSerializer
+
+
+@extend_schema_view(
+    list=extend_schema(summary="Jobs list", tags=["Jobs"]),
+    retrieve=extend_schema(summary="Get job status", tags=["Jobs"]),
+)
+class JobViewSet(ReadOnlyModelViewSet):
+    """ ViewSet for following the background jobs of the user """
+    serializer_class = JobSerializer
+
+    def get_queryset(self):
+        """ Staff members follow every job, users only their own """
+        if self.request.user.is_staff:
+            return Job.objects.all()
+        return Job.objects.filter(owner=self.request.user)
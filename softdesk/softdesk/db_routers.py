@@ -0,0 +1,31 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Set by ReplicaRoutingMiddleware for the duration of a safe request
+use_replica = ContextVar('use_replica', default=False)
+
+
+class ReplicaRouter:
+    """ Send reads of safe requests to a replica, everything else to the
+        primary database """
+
+    def db_for_read(self, model, **hints):
+        if settings.DATABASE_REPLICAS and use_replica.get():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """ Replicas hold the same rows as the primary """
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """ Replicas copy the schema of the primary, they are never
+            migrated themselves """
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,133 @@
+import hashlib
+import re
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.middleware.gzip import GZipMiddleware
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .db_routers import use_replica
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+re_accepts_gzip = re.compile(r'\bgzip\b')
+
+
+def client_key(request):
+    """ Identify the user behind a request without any database query.
+        The token is verified once, the key is kept on the request for the
+        other middlewares.
+        Returns:
+            str | None: user id from the JWT or the session, else the IP
+    """
+    if not hasattr(request, '_client_key'):
+        request._client_key = _resolve_client_key(request)
+    return request._client_key
+
+
+def _resolve_client_key(request):
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = header and authentication.get_raw_token(header)
+    if raw_token:
+        try:
+            token = authentication.get_validated_token(raw_token)
+            return f'user:{token[jwt_settings.USER_ID_CLAIM]}'
+        except (InvalidToken, TokenError, KeyError):
+            return None
+    session = getattr(request, 'session', None)
+    if session is not None and session.get(SESSION_KEY):
+        return f'user:{session[SESSION_KEY]}'
+    return f"ip:{request.META.get('REMOTE_ADDR', '')}"
+
+
+class ReplicaRoutingMiddleware:
+    """ Route the queries of safe requests to the read replicas.
+        After a write, the same client keeps reading from the primary for
+        REPLICA_STICKY_SECONDS so it always sees its own changes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    @staticmethod
+    def sticky_cache_key(key):
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return f'replica-sticky:{digest}'
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        key = client_key(request)
+        sticky_key = key and self.sticky_cache_key(key)
+        safe = request.method in SAFE_METHODS
+        token = use_replica.set(
+            safe and not (sticky_key and cache.get(sticky_key)))
+        try:
+            response = self.get_response(request)
+        finally:
+            use_replica.reset(token)
+
+        if not safe and sticky_key:
+            cache.set(sticky_key, True, settings.REPLICA_STICKY_SECONDS)
+        return response
+
+
+class ConcurrencyLimitMiddleware:
+    """ Answer 429 to a client that already has MAX_CONCURRENT_REQUESTS
+        requests in flight, so one client cannot hold every worker """
+    retry_after = 1
+    # Counters of crashed workers expire after this many seconds
+    counter_timeout = 60
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        key = client_key(request)
+        if key is None:
+            return self.get_response(request)
+
+        counter = f'in-flight:{hashlib.sha1(key.encode()).hexdigest()}'
+        cache.add(counter, 0, self.counter_timeout)
+        try:
+            in_flight = cache.incr(counter)
+        except ValueError:
+            # The counter expired between add() and incr()
+            cache.set(counter, 1, self.counter_timeout)
+            in_flight = 1
+        try:
+            if in_flight > settings.MAX_CONCURRENT_REQUESTS:
+                response = JsonResponse(
+                    {'detail': 'Too many concurrent requests.'}, status=429)
+                response['Retry-After'] = str(self.retry_after)
+                return response
+            return self.get_response(request)
+        finally:
+            try:
+                cache.decr(counter)
+            except ValueError:
+                pass
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """ gzip API responses of the RESPONSE_COMPRESSION content types.
+        Bodies below MIN_SIZE are sent as is, their compression costs more
+        CPU than the bytes it saves. The rest is left to Django's
+        GZipMiddleware, which also compresses streaming responses on the fly
+        and pads the gzip header against BREACH.
+    """
+
+    def process_response(self, request, response):
+        content_type = response.get('Content-Type', '').split(';')[0]
+        if content_type not in settings.RESPONSE_COMPRESSION['CONTENT_TYPES']:
+            return response
+        if (not response.streaming and len(response.content)
+                < settings.RESPONSE_COMPRESSION['MIN_SIZE']):
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,123 @@
+from django.conf import settings
+from django.core.paginator import Page, Paginator
+from django.db.models import Count, Window
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class PageSizePagination(PageNumberPagination):
+    """ Page number pagination with a client page size.
+        ?page_size=<n> is honored up to MAX_PAGE_SIZE and ?count=false
+        skips the COUNT(*) query: one extra row is fetched to know if there
+        is a next page, and the count of the response is null.
+    """
+    page_size_query_param = 'page_size'
+    count_query_param = 'count'
+    page = None
+
+    @property
+    def max_page_size(self):
+        return settings.REST_FRAMEWORK.get('MAX_PAGE_SIZE')
+
+    def skip_count(self, request):
+        return (request.query_params.get(self.count_query_param, '').lower()
+                in ('false', '0', 'no'))
+
+    def invalid_page(self, page_number, message):
+        return NotFound(self.invalid_page_message.format(
+            page_number=page_number, message=message))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page = None
+        if not self.skip_count(request):
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.request = request
+        page_number = request.query_params.get(self.page_query_param, 1)
+        try:
+            self.page_number = int(page_number)
+        except ValueError:
+            self.page_number = 0
+        if self.page_number < 1:
+            raise self.invalid_page(page_number,
+                                    'That page number is not an integer')
+
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and self.page_number > 1:
+            raise self.invalid_page(page_number,
+                                    'That page contains no results')
+        self.has_next = len(rows) > page_size
+        return rows[:page_size]
+
+    def get_paginated_response(self, data):
+        if self.page is not None:
+            return super().get_paginated_response(data)
+        return Response({
+            'count': None,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count']['nullable'] = True
+        return response_schema
+
+    def get_next_link(self):
+        if self.page is not None:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param,
+                                   self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.page is not None:
+            return super().get_previous_link()
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param,
+                                   self.page_number - 1)
+
+
+class WindowCountPagination(PageSizePagination):
+    """ Page number pagination reading the total count with the rows of the
+        page, by a COUNT(*) OVER () window: a page is a single query.
+    """
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.skip_count(request):
+            return super().paginate_queryset(queryset, request, view)
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.request = request
+        page_number = request.query_params.get(self.page_query_param, 1)
+        try:
+            page_number = int(page_number)
+        except ValueError:
+            page_number = 0
+        if page_number < 1:
+            raise self.invalid_page(page_number,
+                                    'That page number is not an integer')
+
+        offset = (page_number - 1) * page_size
+        rows = list(queryset.annotate(total_count=Window(Count('pk')))
+                    [offset:offset + page_size])
+        if not rows and page_number > 1:
+            raise self.invalid_page(page_number,
+                                    'That page contains no results')
+        paginator = Paginator(queryset, page_size)
+        paginator.count = rows[0].total_count if rows else 0
+        self.page = Page(rows, page_number, paginator)
+        return rows
@@ -0,0 +1,85 @@
+import gzip
+import hashlib
+import json
+from functools import lru_cache
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SpectacularAPIView
+
+from .middleware import re_accepts_gzip
+
+
+def artifact_path():
+    """ Path of the schema artifact of the current API version """
+    version = settings.SPECTACULAR_SETTINGS['VERSION']
+    return settings.SCHEMA_ARTIFACT_DIR / f'openapi-{version}.json.gz'
+
+
+def generate_schema():
+    """ Introspect the views and return the OpenAPI document """
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    return generator.get_schema(request=None, public=True)
+
+
+def dump_schema(schema):
+    """ Serialize a schema to its reproducible compressed artifact """
+    return gzip.compress(json.dumps(schema).encode(), 9, mtime=0)
+
+
+def load_schema():
+    """ Return the schema of the artifact, None when it was not built """
+    try:
+        return json.loads(gzip.decompress(artifact_path().read_bytes()))
+    except FileNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def rendered_schema(renderer_class):
+    """ Render the schema once per process and format.
+        The artifact is used when built, otherwise the schema is generated
+        on the first call.
+
+        Returns:
+            the gzip compressed document and its ETag
+    """
+    schema = load_schema()
+    if schema is None:
+        schema = generate_schema()
+    document = renderer_class().render(schema, renderer_context={})
+    etag = f'W/"{hashlib.sha256(document).hexdigest()[:32]}"'
+    return gzip.compress(document, 6, mtime=0), etag
+
+
+class CachedSchemaView(SpectacularAPIView):
+    """ Serve the pre-generated schema with an ETag.
+        Requests for another language are generated live.
+    """
+
+    @extend_schema(exclude=True)
+    def get(self, request, *args, **kwargs):
+        if settings.USE_I18N and request.GET.get('lang'):
+            return super().get(request, *args, **kwargs)
+
+        renderer = request.accepted_renderer
+        compressed, etag = rendered_schema(type(renderer))
+        if etag.removeprefix('W/') in [
+                tag.removeprefix('W/') for tag in parse_etags(
+                    request.headers.get('If-None-Match', ''))]:
+            response = HttpResponseNotModified()
+        elif re_accepts_gzip.search(request.headers.get('Accept-Encoding',
+                                                        '')):
+            response = HttpResponse(compressed,
+                                    content_type=renderer.media_type)
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(gzip.decompress(compressed),
+                                    content_type=renderer.media_type)
+        response['ETag'] = etag
+        patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+        return response
@@ -0,0 +1,25 @@
+from rest_framework import serializers
+from rest_framework.utils import model_meta
+
+
+class UpdateFieldsModelSerializer(serializers.ModelSerializer):
+    """ Model serializer saving only the columns of the validated fields on
+        update, so a partial update is a narrow UPDATE statement.
+    """
+
+    def update(self, instance, validated_data):
+        info = model_meta.get_field_info(instance)
+        to_many = {}
+        for attr, value in validated_data.items():
+            if attr in info.relations and info.relations[attr].to_many:
+                to_many[attr] = value
+            else:
+                setattr(instance, attr, value)
+
+        update_fields = [attr for attr in validated_data
+                         if attr not in to_many]
+        if update_fields:
+            instance.save(update_fields=update_fields)
+        for attr, value in to_many.items():
+            getattr(instance, attr).set(value)
+        return instance
@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/5.2/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -42,15 +43,19 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
     'authentication',
     'support',
+    'jobs',
     'drf_spectacular',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'softdesk.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'softdesk.middleware.ConcurrencyLimitMiddleware',
+    'softdesk.middleware.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -78,13 +83,67 @@ WSGI_APPLICATION = 'softdesk.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Every SOFTDESK_DB_* environment variable below is optional, the defaults
+# keep the local SQLite file.
+
+DB_ENGINE = os.environ.get('SOFTDESK_DB_ENGINE',
+                           'django.db.backends.sqlite3')
+DB_POOL = os.environ.get('SOFTDESK_DB_POOL', '') == '1'
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'ENGINE': DB_ENGINE,
+        'NAME': os.environ.get('SOFTDESK_DB_NAME', BASE_DIR / 'db.sqlite3'),
+        'USER': os.environ.get('SOFTDESK_DB_USER', ''),
+        'PASSWORD': os.environ.get('SOFTDESK_DB_PASSWORD', ''),
+        'HOST': os.environ.get('SOFTDESK_DB_HOST', ''),
+        'PORT': os.environ.get('SOFTDESK_DB_PORT', ''),
+        # Pooled connections are handed back to the pool after each
+        # request, persistent ones are kept by the worker for this long.
+        'CONN_MAX_AGE': 0 if DB_POOL else int(
+            os.environ.get('SOFTDESK_DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {},
     }
 }
 
+if DB_ENGINE == 'django.db.backends.sqlite3':
+    # WAL lets readers run next to a writer, IMMEDIATE transactions take
+    # the write lock upfront so that concurrent writers wait for it (up to
+    # timeout seconds) instead of failing with "database is locked".
+    DATABASES['default']['OPTIONS'] = {
+        'timeout': int(os.environ.get('SOFTDESK_DB_TIMEOUT', 20)),
+        'transaction_mode': 'IMMEDIATE',
+        'init_command': 'PRAGMA journal_mode=WAL;'
+                        'PRAGMA synchronous=NORMAL;',
+    }
+elif DB_POOL:
+    # Requires the PostgreSQL backend with psycopg[pool]
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.environ.get('SOFTDESK_DB_POOL_MIN', 2)),
+            'max_size': int(os.environ.get('SOFTDESK_DB_POOL_MAX', 10)),
+        },
+    }
+
+
+# Read replicas, a comma separated list of database names (SQLite) or hosts
+# holding a copy of the default database. Safe requests read from them.
+DATABASE_REPLICAS = []
+for index, replica in enumerate(
+        filter(None, os.environ.get('SOFTDESK_DB_REPLICAS', '').split(','))):
+    alias = f'replica_{index}'
+    DATABASES[alias] = dict(DATABASES['default'],
+                            TEST={'MIRROR': 'default'})
+    DATABASES[alias]['NAME' if DB_ENGINE.endswith('sqlite3')
+                     else 'HOST'] = replica.strip()
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['softdesk.db_routers.ReplicaRouter']
+
+# Seconds during which a client reads from the primary after a write
+REPLICA_STICKY_SECONDS = int(os.environ.get('SOFTDESK_REPLICA_STICKY', 5))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -109,6 +168,42 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Cache. Throttling, the cap on concurrent requests and replica stickiness
+# keep their state in it, and rely on its atomic add() and incr(). Their
+# limits only hold across workers with a shared backend: memcached, redis
+# or database. The default LocMemCache keeps a separate state in every
+# worker process.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'SOFTDESK_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('SOFTDESK_CACHE_LOCATION', 'softdesk'),
+    }
+}
+
+
+# Password hashers, the first one hashes new passwords and the others still
+# verify existing hashes. argon2 needs argon2-cffi, bcrypt needs bcrypt.
+_PASSWORD_HASHERS = {
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'bcrypt': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+}
+PASSWORD_HASHER = os.environ.get('SOFTDESK_PASSWORD_HASHER', 'pbkdf2')
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    hasher for name, hasher in _PASSWORD_HASHERS.items()
+    if name != PASSWORD_HASHER
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
+# Bulk user provisioning, processes hashing passwords (default: CPU count)
+# and maximum number of users accepted by one API request.
+PROVISIONING_WORKERS = int(os.environ.get('SOFTDESK_PROVISIONING_WORKERS',
+                                          0)) or None
+PROVISIONING_MAX_USERS = 1000
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -135,24 +230,70 @@ AUTH_USER_MODEL = 'authentication.CustomUser'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.authentication.RevocableJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS':
-        'rest_framework.pagination.PageNumberPagination',
+        'softdesk.pagination.PageSizePagination',
     'PAGE_SIZE': 5,
     'MAX_PAGE_SIZE': 100,
+    'DEFAULT_THROTTLE_CLASSES': (
+        'softdesk.throttling.UserTokenBucketThrottle',
+        'softdesk.throttling.AnonTokenBucketThrottle',
+        'softdesk.throttling.ScopedTokenBucketThrottle',
+    ),
+    # Bucket capacity / refill period, scopes other than user and anon are
+    # the throttle_scope of the views
+    'DEFAULT_THROTTLE_RATES': {
+        'user': '600/min',
+        'anon': '60/min',
+        'users': '30/min',
+        'comments': '120/min',
+    },
+}
+
+# How long the response of a POST request with an Idempotency-Key header is
+# kept and replayed to retries
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+# A key whose request is still running after this is considered abandoned,
+# by a crashed worker, and a retry runs the request again
+IDEMPOTENCY_KEY_LEASE = timedelta(seconds=60)
+
+# Finished issues older than this, without any comment since, are moved to
+# the archive tables by `python manage.py archive_issues`
+ISSUE_ARCHIVE_AFTER = timedelta(days=180)
+
+# gzip compression of API responses, smaller bodies are sent as is
+RESPONSE_COMPRESSION = {
+    'MIN_SIZE': 1024,
+    'CONTENT_TYPES': ('application/json', 'application/vnd.oai.openapi',
+                      'text/csv'),
 }
 
+# Pre-generated OpenAPI schema served at api/schema/, built with
+# `python manage.py build_schema`
+SCHEMA_ARTIFACT_DIR = BASE_DIR / 'schema'
+
+# Requests of one client being processed at the same time, above it the API
+# answers 429 Too Many Requests
+MAX_CONCURRENT_REQUESTS = 8
+
 SIMPLE_JWT = {
-    'ACCESS_TOKEN_LIFETIME': timedelta(days=60),
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'ROTATE_REFRESH_TOKENS': False,
+    'TOKEN_REFRESH_SERIALIZER':
+        'authentication.serializers.RevocableTokenRefreshSerializer',
 }
 
+# Revoked tokens are loaded in memory by every worker, new revocations reach
+# the other workers within TOKEN_REVOCATION_SYNC_SECONDS.
+TOKEN_REVOCATION_SYNC_SECONDS = 5
+TOKEN_REVOCATION_REBUILD_SECONDS = 3600
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'SoftDesk Support API',
     'DESCRIPTION': 'This interactive documentation provides requests for '
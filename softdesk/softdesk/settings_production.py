@@ -0,0 +1,43 @@
+"""
+Lean settings profile for API-only production workers.
+
+Select it with DJANGO_SETTINGS_MODULE=softdesk.settings_production. The
+admin, the browsable API and the OpenAPI schema are not loaded, so workers
+boot faster and use less memory; serve them from a process running the
+default settings. Compare both profiles with
+`python manage.py bench_startup`.
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK, TEMPLATES
+
+DEBUG = False
+
+ALLOWED_HOSTS = [host for host in os.environ.get(
+    'SOFTDESK_ALLOWED_HOSTS', '').split(',') if host]
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in (
+    'django.contrib.admin',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'drf_spectacular',
+)]
+
+MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware !=
+              'django.contrib.messages.middleware.MessageMiddleware']
+
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'OPTIONS': {'context_processors': [
+        processor for processor in TEMPLATES[0]['OPTIONS'][
+            'context_processors']
+        if processor !=
+        'django.contrib.messages.context_processors.messages']},
+}]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ('rest_framework.renderers.JSONRenderer',),
+    'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.openapi.AutoSchema',
+}
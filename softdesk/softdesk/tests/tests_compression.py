@@ -0,0 +1,68 @@
+import gzip
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from softdesk.middleware import CompressionMiddleware
+
+COMPRESSION = {
+    'MIN_SIZE': 100,
+    'CONTENT_TYPES': ('application/json',),
+}
+BODY = b'{"results": [' + b'{"name": "issue", "status": "todo"},' * 20 + b']}'
+
+
+@override_settings(RESPONSE_COMPRESSION=COMPRESSION)
+class CompressionMiddlewareTest(SimpleTestCase):
+    """ Tests for the response compression middleware """
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def call(self, response, accept_encoding='gzip, deflate'):
+        middleware = CompressionMiddleware(lambda request: response)
+        request = self.factory.get('/projects/',
+                                   HTTP_ACCEPT_ENCODING=accept_encoding)
+        return middleware(request)
+
+    def test_large_json_is_compressed(self):
+        response = self.call(HttpResponse(
+            BODY, content_type='application/json'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), BODY)
+        self.assertEqual(int(response['Content-Length']),
+                         len(response.content))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_gzip_header_is_padded(self):
+        response = self.call(HttpResponse(
+            BODY, content_type='application/json'))
+        self.assertTrue(response.content[3] & gzip.FNAME)
+
+    def test_small_body_is_not_compressed(self):
+        response = self.call(HttpResponse(
+            b'{"id": 1}', content_type='application/json'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, b'{"id": 1}')
+
+    def test_client_without_gzip_support(self):
+        response = self.call(HttpResponse(
+            BODY, content_type='application/json'), accept_encoding='br')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_other_content_type_is_not_compressed(self):
+        response = self.call(HttpResponse(BODY, content_type='image/png'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_streaming_response_is_compressed(self):
+        chunks = [b'id,name\n'] + [b'%d,issue\n' % i for i in range(500)]
+        response = self.call(StreamingHttpResponse(
+            iter(chunks), content_type='application/json'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response)),
+                         b''.join(chunks))
+
+    def test_etag_is_weakened(self):
+        response = HttpResponse(BODY, content_type='application/json')
+        response['ETag'] = '"abc"'
+        response = self.call(response)
+        self.assertEqual(response['ETag'], 'W/"abc"')
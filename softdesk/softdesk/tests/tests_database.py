@@ -0,0 +1,73 @@
+import tempfile
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, TestCase
+
+
+class SQLiteSettingsTest(TestCase):
+    """ Tests for the pragmas applied on each SQLite connection """
+
+    def test_busy_timeout_and_synchronous(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 20000)
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+
+class SQLiteConcurrencyTest(SimpleTestCase):
+    """ Concurrent writers on a file database with the project settings """
+    WRITERS = 8
+    WRITES = 25
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.db_settings = dict(settings.DATABASES['default'],
+                                NAME=str(Path(tmpdir.name) / 'db.sqlite3'))
+        wrapper = DatabaseWrapper(dict(self.db_settings), 'concurrency')
+        with wrapper.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(cursor.fetchone()[0], 'wal')
+            cursor.execute('CREATE TABLE counter (value integer)')
+            cursor.execute('INSERT INTO counter VALUES (0)')
+        wrapper.close()
+
+    def writer(self, errors):
+        wrapper = DatabaseWrapper(dict(self.db_settings), 'concurrency')
+        try:
+            for _ in range(self.WRITES):
+                # Read then write in one transaction, the pattern that
+                # fails right away with deferred transactions.
+                with wrapper.cursor() as cursor:
+                    cursor.execute(f'BEGIN {wrapper.transaction_mode}')
+                    cursor.execute('SELECT value FROM counter')
+                    value = cursor.fetchone()[0]
+                    cursor.execute('UPDATE counter SET value = %s',
+                                   [value + 1])
+                    cursor.execute('COMMIT')
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            wrapper.close()
+
+    def test_concurrent_writers_are_not_locked_out(self):
+        errors = []
+        threads = [threading.Thread(target=self.writer, args=(errors,))
+                   for _ in range(self.WRITERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        wrapper = DatabaseWrapper(dict(self.db_settings), 'concurrency')
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT value FROM counter')
+            self.assertEqual(cursor.fetchone()[0],
+                             self.WRITERS * self.WRITES)
+        wrapper.close()
@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from support.models import Project
+
+User = get_user_model()
+
+
+@override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK,
+                                   'PAGE_SIZE': 5, 'MAX_PAGE_SIZE': 10})
+class PageSizePaginationTest(APITestCase):
+    """ Tests for the client page size and the optional count """
+    def setUp(self):
+        self.list_url = reverse('project-list')
+        self.user1 = User.objects.create(username="user1", age=23)
+        for index in range(12):
+            project = Project.objects.create(
+                author=self.user1, name=f"project{index}",
+                description="description", type="backend")
+            project.contributors.add(self.user1)
+        self.client.force_authenticate(user=self.user1)
+
+    def test_default_page_size(self):
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 12)
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_client_page_size(self):
+        response = self.client.get(self.list_url, {'page_size': 8})
+        self.assertEqual(len(response.data['results']), 8)
+        self.assertIn('page_size=8', response.data['next'])
+
+    def test_page_size_capped_to_max(self):
+        response = self.client.get(self.list_url, {'page_size': 1000})
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_skip_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url,
+                                       {'count': 'false', 'page_size': 10})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('COUNT(' in query['sql']
+                             for query in queries.captured_queries))
+        self.assertIsNone(response.data['count'])
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertIsNone(response.data['previous'])
+        self.assertIn('page=2', response.data['next'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNone(response.data['next'])
+        self.assertNotIn('page=', response.data['previous'])
+
+    def test_skip_count_invalid_page(self):
+        response = self.client.get(self.list_url,
+                                   {'count': 'false', 'page': 9})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(self.list_url,
+                                   {'count': 'false', 'page': 'last'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
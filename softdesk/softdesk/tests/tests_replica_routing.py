@@ -0,0 +1,125 @@
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, connections, router
+from django.test import SimpleTestCase, TransactionTestCase, \
+    override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from support.models import Project
+
+User = get_user_model()
+
+REPLICA = 'replica_test'
+
+
+@skipUnless(connection.vendor == 'sqlite', "The replica is a SQLite copy")
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRoutingTest(TransactionTestCase):
+    """ Tests for read replica routing. The replica is registered for this
+        class only, once the test databases are set up, in a SQLite file of
+        its own temporary directory. It is a copy of the primary test
+        database taken before each test. """
+    databases = {'default'}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.replica_path = str(Path(cls.tmpdir.name) / 'replica.sqlite3')
+        connections.settings[REPLICA] = dict(
+            connections.settings['default'], NAME=cls.replica_path)
+        cls.databases = {'default', REPLICA}
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.databases = {'default'}
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        cls.tmpdir.cleanup()
+        super().tearDownClass()
+
+    def copy_primary_to_replica(self):
+        connections[REPLICA].close()
+        connections['default'].ensure_connection()
+        replica = sqlite3.connect(self.replica_path)
+        try:
+            connections['default'].connection.backup(replica)
+        finally:
+            replica.close()
+
+    def setUp(self):
+        cache.clear()
+        self.copy_primary_to_replica()
+        for alias in ('default', REPLICA):
+            self.user = User.objects.db_manager(alias).create_user(
+                id=1,
+                username="user1",
+                password="pass123",
+                first_name="user1",
+                last_name="Test",
+                age=23
+            )
+            project = Project.objects.using(alias).create(
+                author=self.user,
+                name=f"project on {alias}",
+                description="description",
+                type="backend")
+            # Writes always go to the primary, seed the replica directly
+            Project.contributors.through.objects.using(alias).create(
+                project=project, customuser=self.user)
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def list_names(self):
+        response = self.client.get(reverse('project-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {p["name"] for p in response.data["results"]}
+
+    def test_safe_requests_read_from_replica(self):
+        self.assertSetEqual(self.list_names(), {f"project on {REPLICA}"})
+
+    def test_writes_go_to_primary_and_stick(self):
+        payload = {
+            "name": "new project",
+            "description": "description",
+            "type": "ios",
+        }
+        response = self.client.post(reverse('project-list'), payload,
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Project.objects.using('default')
+                        .filter(name="new project").exists())
+        self.assertFalse(Project.objects.using(REPLICA)
+                         .filter(name="new project").exists())
+
+        self.assertSetEqual(self.list_names(),
+                            {"project on default", "new project"})
+
+    def test_stickiness_is_per_user(self):
+        self.client.post(reverse('project-list'), {}, format='json')
+        other = APIClient()
+        other_user = User.objects.db_manager(REPLICA).create_user(
+            id=2, username="user2", password="pass123", age=30)
+        other.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(other_user)}')
+        response = other.get(reverse('project-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 0)
+
+
+class ReplicaRouterTest(SimpleTestCase):
+    """ Tests for the migrations of the replica aliases """
+    @override_settings(DATABASE_REPLICAS=['replica_0'])
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(router.allow_migrate('replica_0', 'support'))
+        self.assertTrue(router.allow_migrate('default', 'support'))
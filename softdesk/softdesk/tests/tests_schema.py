@@ -0,0 +1,46 @@
+import gzip
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from softdesk.schema import rendered_schema
+
+
+class CachedSchemaTest(APITestCase):
+    """ Tests for the pre-generated OpenAPI schema """
+    def setUp(self):
+        self.schema_url = reverse('schema')
+        rendered_schema.cache_clear()
+        self.addCleanup(rendered_schema.cache_clear)
+
+    def test_artifact_matches_code(self):
+        call_command('build_schema', '--check', stdout=StringIO(),
+                     stderr=StringIO())
+
+    def test_schema_served_with_etag(self):
+        response = self.client.get(self.schema_url, {'format': 'json'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'],
+                         'application/vnd.oai.openapi+json')
+        self.assertIn('/projects/', json.loads(response.content)['paths'])
+        self.assertTrue(response['ETag'].startswith('W/"'))
+
+        response = self.client.get(self.schema_url, {'format': 'json'},
+                                   HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_schema_served_compressed(self):
+        response = self.client.get(self.schema_url,
+                                   HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(b'openapi:', gzip.decompress(response.content))
+
+    def test_formats_have_their_own_etag(self):
+        yaml = self.client.get(self.schema_url)
+        json_schema = self.client.get(self.schema_url, {'format': 'json'})
+        self.assertEqual(yaml['Content-Type'], 'application/vnd.oai.openapi')
+        self.assertNotEqual(yaml['ETag'], json_schema['ETag'])
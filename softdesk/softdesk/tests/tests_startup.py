@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+BOOT = '''
+import sys
+from softdesk.wsgi import application
+from django.urls import get_resolver, reverse
+get_resolver().url_patterns
+reverse('project-list')
+print(' '.join(sorted(sys.modules)))
+'''
+
+
+class ProductionProfileTest(SimpleTestCase):
+    """ Tests for the lean production settings profile """
+    def boot(self, settings_module):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module}
+        output = subprocess.run(
+            [sys.executable, '-c', BOOT], env=env, cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True).stdout
+        return set(output.split())
+
+    def test_optional_apps_not_loaded(self):
+        modules = self.boot('softdesk.settings_production')
+        self.assertIn('support.views', modules)
+        self.assertNotIn('support.admin', modules)
+        self.assertNotIn('drf_spectacular.openapi', modules)
+        self.assertNotIn('drf_spectacular.views', modules)
+
+    def test_default_profile_loads_them(self):
+        modules = self.boot('softdesk.settings')
+        self.assertIn('support.admin', modules)
+        self.assertIn('drf_spectacular.views', modules)
@@ -0,0 +1,166 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from softdesk.middleware import ConcurrencyLimitMiddleware, \
+    ReplicaRoutingMiddleware
+from softdesk.throttling import UserTokenBucketThrottle
+
+User = get_user_model()
+
+RATES = {
+    'user': '3/min',
+    'anon': '2/min',
+    'users': '100/min',
+    'comments': '100/min',
+}
+
+
+@override_settings(REST_FRAMEWORK={
+    'DEFAULT_AUTHENTICATION_CLASSES': (
+        'rest_framework_simplejwt.authentication.JWTAuthentication',
+    ),
+    'DEFAULT_PAGINATION_CLASS':
+        'rest_framework.pagination.PageNumberPagination',
+    'PAGE_SIZE': 5,
+    'DEFAULT_THROTTLE_CLASSES': (
+        'softdesk.throttling.UserTokenBucketThrottle',
+        'softdesk.throttling.AnonTokenBucketThrottle',
+        'softdesk.throttling.ScopedTokenBucketThrottle',
+    ),
+    'DEFAULT_THROTTLE_RATES': RATES,
+})
+class TokenBucketThrottleTest(APITestCase):
+    """ Tests for the token bucket throttles """
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user1 = User.objects.create(username="user1", age=23)
+        self.user2 = User.objects.create(username="user2", age=33)
+
+    def test_user_bucket_is_per_user(self):
+        self.client.force_authenticate(user=self.user1)
+        for _ in range(3):
+            response = self.client.get(reverse('project-list'))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(reverse('project-list'))
+        self.assertEqual(response.status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+
+        self.client.force_authenticate(user=self.user2)
+        response = self.client.get(reverse('project-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_anonymous_bucket_is_per_ip(self):
+        payload = {"username": "new", "age": 20, "first_name": "New",
+                   "last_name": "User", "can_be_contacted": False,
+                   "can_data_be_shared": False}
+        for index in range(2):
+            response = self.client.post(
+                reverse('user-list'), dict(payload, username=f"new{index}"),
+                format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(reverse('user-list'), payload,
+                                    format='json')
+        self.assertEqual(response.status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_scoped_bucket(self):
+        RATES['users'] = '1/min'
+        self.addCleanup(RATES.update, {'users': '100/min'})
+        self.client.force_authenticate(user=self.user1)
+        self.assertEqual(self.client.get(reverse('user-list')).status_code,
+                         status.HTTP_200_OK)
+        self.assertEqual(self.client.get(reverse('user-list')).status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.client.get(reverse('project-list'))
+                         .status_code, status.HTTP_200_OK)
+
+    def test_concurrent_requests_share_the_bucket(self):
+        request = RequestFactory().get('/')
+        request.user = self.user1
+        barrier = threading.Barrier(10)
+        allowed = []
+
+        class SlowReadCache:
+            """ Widen the window between reading and writing a bucket """
+            def __getattr__(self, name):
+                return getattr(cache, name)
+
+            def get(self, *args, **kwargs):
+                value = cache.get(*args, **kwargs)
+                time.sleep(0.01)
+                return value
+
+        class SlowReadThrottle(UserTokenBucketThrottle):
+            cache = SlowReadCache()
+
+        def attempt():
+            barrier.wait()
+            allowed.append(SlowReadThrottle().allow_request(request, None))
+
+        threads = [threading.Thread(target=attempt) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(allowed.count(True), 3)
+
+
+@override_settings(MAX_CONCURRENT_REQUESTS=1)
+class ConcurrencyLimitTest(APITestCase):
+    """ Tests for the in-flight requests cap """
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.factory = RequestFactory()
+
+    def test_concurrent_request_is_rejected(self):
+        nested = []
+
+        def view(request):
+            # A second request of the same client while this one runs
+            nested.append(middleware(self.factory.get('/projects/')))
+            return HttpResponse()
+
+        middleware = ConcurrencyLimitMiddleware(view)
+        response = middleware(self.factory.get('/projects/'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(nested[0].status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(nested[0]['Retry-After'], '1')
+
+    def test_counter_is_released(self):
+        middleware = ConcurrencyLimitMiddleware(lambda request:
+                                                HttpResponse())
+        for _ in range(3):
+            response = middleware(self.factory.get('/projects/'))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(DATABASE_REPLICAS=['replica'])
+    def test_token_is_verified_once(self):
+        user = get_user_model().objects.create(username='user', age=30)
+        request = self.factory.get(
+            '/projects/',
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        middleware = ConcurrencyLimitMiddleware(
+            ReplicaRoutingMiddleware(lambda request: HttpResponse()))
+        with mock.patch.object(
+                JWTAuthentication, 'get_validated_token',
+                autospec=True,
+                side_effect=JWTAuthentication.get_validated_token) as verify:
+            middleware(request)
+        self.assertEqual(verify.call_count, 1)
+        self.assertEqual(request._client_key, f'user:{user.pk}')
@@ -0,0 +1,111 @@
+import time
+
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """ Token bucket throttle.
+        A bucket holds at most num_requests tokens and refills continuously
+        at num_requests per period, so clients may burst up to the bucket
+        size and are then held to the average rate. The rate of the scope
+        comes from DEFAULT_THROTTLE_RATES, e.g. '600/min'.
+        A bucket is read and written under a lock taken with the atomic
+        cache.add(), so concurrent requests of a client cannot spend the
+        same token.
+    """
+    scope = None
+    cache = cache
+    cache_format = 'throttle_%(scope)s_%(ident)s'
+    durations = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    # Seconds a lock outlives a worker dying while holding it, and how long
+    # a request waits for the lock before being throttled
+    lock_timeout = 1
+    lock_attempts = 50
+    lock_delay = 0.002
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_scope(self, view):
+        return self.scope
+
+    def get_ident_key(self, request, view):
+        """ Return the identity of the client, None to skip the throttle """
+        raise NotImplementedError('.get_ident_key() must be overridden')
+
+    def parse_rate(self, rate):
+        """ Return the bucket size and refill rate in tokens per second """
+        num, period = rate.split('/')
+        capacity = int(num)
+        return capacity, capacity / self.durations[period[0]]
+
+    def acquire(self, lock):
+        for _ in range(self.lock_attempts):
+            if self.cache.add(lock, 1, self.lock_timeout):
+                return True
+            time.sleep(self.lock_delay)
+        return False
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        ident = self.get_ident_key(request, view)
+        if rate is None or ident is None:
+            return True
+
+        capacity, refill = self.parse_rate(rate)
+        key = self.cache_format % {'scope': scope, 'ident': ident}
+        lock = f'{key}_lock'
+        if not self.acquire(lock):
+            self.wait_seconds = 1 / refill
+            return False
+        try:
+            now = time.time()
+            tokens, updated = self.cache.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            else:
+                self.wait_seconds = (1 - tokens) / refill
+            self.cache.set(key, (tokens, now), int(capacity / refill) + 1)
+        finally:
+            self.cache.delete(lock)
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """ Throttle authenticated users on their id """
+    scope = 'user'
+
+    def get_ident_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return request.user.pk
+        return None
+
+
+class AnonTokenBucketThrottle(TokenBucketThrottle):
+    """ Throttle anonymous clients on their IP address """
+    scope = 'anon'
+
+    def get_ident_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.get_ident(request)
+
+
+class ScopedTokenBucketThrottle(TokenBucketThrottle):
+    """ Throttle each client separately on the views with a throttle_scope """
+
+    def get_scope(self, view):
+        return getattr(view, 'throttle_scope', None)
+
+    def get_ident_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return f'user-{request.user.pk}'
+        return f'ip-{self.get_ident(request)}'
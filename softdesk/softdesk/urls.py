@@ -14,24 +14,17 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from django.apps import apps
 from django.contrib.auth.views import LogoutView
 from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework import routers
 from rest_framework_simplejwt.views import TokenObtainPairView, \
     TokenRefreshView
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.authentication import SessionAuthentication
 
-from authentication.views import CustomUserViewSet
+from authentication.views import CustomUserViewSet, TokenRevokeView
+from jobs.views import JobViewSet
 from support.views import ProjectViewSet, ProjectContributorViewSet, \
-    IssueViewSet, CommentViewSet
-
-
-class SwaggerProtectedView(SpectacularSwaggerView):
-    authentication_classes = [SessionAuthentication]
-    permission_classes = [IsAuthenticated]
+    IssueViewSet, IssueBatchView, CommentViewSet
 
 
 router = routers.DefaultRouter()
@@ -44,17 +37,35 @@ router.register(r'projects/(?P<project_id>\d+)/issues',
 router.register(r'projects/(?P<project_id>\d+)/issues/('
                 r'?P<issue_id>\d+)/comments', CommentViewSet,
                 basename='project-issue-comment')
+router.register(r'jobs', JobViewSet, basename='job')
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api-auth/', include('rest_framework.urls')),
     path('api/token/', TokenObtainPairView.as_view(),
          name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(),
          name='token_refresh'),
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'),
-         name='swagger-ui'),
+    path('api/token/revoke/', TokenRevokeView.as_view(),
+         name='token_revoke'),
+    path('issues/batch/', IssueBatchView.as_view(), name='issue-batch'),
     path('', include(router.urls)),
     path('logout/', LogoutView.as_view(), name='logout'),
 ]
+
+# The admin and the API documentation are routed only when their apps are
+# installed, see settings_production.py
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns += [path('admin/', admin.site.urls)]
+
+if apps.is_installed('drf_spectacular'):
+    from drf_spectacular.views import SpectacularSwaggerView
+
+    from softdesk.schema import CachedSchemaView
+
+    urlpatterns += [
+        path('api/schema/', CachedSchemaView.as_view(), name='schema'),
+        path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'),
+             name='swagger-ui'),
+    ]
@@ -1,7 +1,10 @@
 from django.contrib import admin
 
-from .models import Project, Issue, Comment
+from .models import Project, Issue, Comment, ArchivedIssue, \
+    ArchivedComment
 
 admin.site.register(Project)
 admin.site.register(Issue)
 admin.site.register(Comment)
+admin.site.register(ArchivedIssue)
+admin.site.register(ArchivedComment)
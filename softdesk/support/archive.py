@@ -0,0 +1,120 @@
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from .models import Issue, Comment, ArchivedIssue, ArchivedComment
+
+ARCHIVE_BATCH_SIZE = 500
+INCLUDE_ARCHIVED_PARAM = 'include_archived'
+
+
+def include_archived(request):
+    """ Whether a read request asked for archived issues and comments too,
+        with ?include_archived=true. Archived rows are never written.
+    """
+    return (request.method in ('GET', 'HEAD', 'OPTIONS')
+            and request.query_params.get(INCLUDE_ARCHIVED_PARAM, '').lower()
+            in ('true', '1', 'yes'))
+
+
+def _copied_fields(model):
+    """ Columns copied from the live table to the archive table of model """
+    return [field.attname for field in model._meta.concrete_fields
+            if field.name != 'archived_time']
+
+
+def archivable_issues(before):
+    """ Finished issues created before the date, without any comment since
+        Args:
+            before (datetime): issues older than this date are archived
+        Returns:
+            QuerySet: issues to move to the archive
+    """
+    recent_comments = Comment.objects.filter(issue=OuterRef('pk'),
+                                             created_time__gte=before)
+    return (Issue.objects
+            .filter(status='finished', created_time__lt=before)
+            .filter(~Exists(recent_comments)))
+
+
+def archive_issues(before, batch_size=ARCHIVE_BATCH_SIZE):
+    """ Move old finished issues and their comments to the archive tables.
+        Each batch of issues is copied then deleted in its own transaction,
+        so an issue is always either live or archived, and the locks are
+        held for batch_size issues at most.
+        Args:
+            before (datetime): issues older than this date are archived
+            batch_size (int): maximum number of issues moved per batch
+        Yields:
+            dict: progress with the number of rows moved so far
+    """
+    progress = {'issues': 0, 'comments': 0, 'done': False}
+    issue_fields = _copied_fields(ArchivedIssue)
+    comment_fields = _copied_fields(ArchivedComment)
+
+    while True:
+        with transaction.atomic():
+            ids = list(archivable_issues(before)
+                       .select_for_update()
+                       .order_by('pk')
+                       .values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            ArchivedIssue.objects.bulk_create(
+                ArchivedIssue(**values) for values in
+                Issue.objects.filter(pk__in=ids).values(*issue_fields))
+            comments = Comment.objects.filter(issue_id__in=ids)
+            ArchivedComment.objects.bulk_create(
+                (ArchivedComment(**values) for values in
+                 comments.values(*comment_fields).iterator()),
+                batch_size=batch_size)
+            progress['comments'] += comments.delete()[0]
+            Issue.objects.filter(pk__in=ids).delete()
+            progress['issues'] += len(ids)
+        yield dict(progress)
+
+    progress['done'] = True
+    yield dict(progress)
+
+
+class ChainedQuerySets:
+    """ Read only sequence of the rows of several querysets, one after the
+        other, for the paginators. A slice only queries the querysets it
+        overlaps, so a page of live issues never reads the archive.
+    """
+    def __init__(self, *querysets):
+        self.querysets = querysets
+        self._counts = {}
+
+    def _count(self, index):
+        if index not in self._counts:
+            self._counts[index] = self.querysets[index].count()
+        return self._counts[index]
+
+    def count(self):
+        return sum(self._count(index)
+                   for index in range(len(self.querysets)))
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            rows = self[key:key + 1]
+            if not rows:
+                raise IndexError(key)
+            return rows[0]
+
+        start, stop = key.start or 0, key.stop
+        rows = []
+        for index, queryset in enumerate(self.querysets):
+            if stop is not None and stop <= start:
+                break
+            part = list(queryset[start:stop])
+            rows.extend(part)
+            if stop is not None and len(part) == stop - start:
+                break
+            size = start + len(part) if part else self._count(index)
+            start = max(0, start - size)
+            if stop is not None:
+                stop -= size
+        return rows
@@ -0,0 +1,79 @@
+from django.db.models import F
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = ('The resource was modified since it was read, fetch '
+                      'it again.')
+    default_code = 'precondition_failed'
+
+
+class VersionedUpdateMixin:
+    """ Optimistic concurrency control on the version column of a model.
+        Responses carry the version as ETag. An update sent with If-Match
+        is a single UPDATE ... WHERE version = <If-Match>, and answers 412
+        when another update won the race. Updates without If-Match still
+        bump the version.
+    """
+
+    @staticmethod
+    def etag(version):
+        return f'"{version}"'
+
+    def expected_versions(self):
+        """ Versions accepted by the If-Match header, None without
+            condition """
+        header = self.request.headers.get('If-Match')
+        if not header or header.strip() == '*':
+            return None
+        versions = []
+        for etag in parse_etags(header):
+            try:
+                versions.append(int(etag.removeprefix('W/').strip('"')))
+            except ValueError:
+                pass
+        if not versions:
+            raise PreconditionFailed()
+        return versions
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args,
+                                             **kwargs)
+        if (self.action in ['retrieve', 'update', 'partial_update', 'create']
+                and isinstance(response.data, dict)
+                and 'version' in response.data):
+            response['ETag'] = self.etag(response.data['version'])
+        return response
+
+    def perform_update(self, serializer):
+        """ Write the validated fields and the next version in one UPDATE,
+            conditioned on the version of If-Match """
+        instance = serializer.instance
+        versions = self.expected_versions()
+        if versions is not None and instance.version not in versions:
+            raise PreconditionFailed()
+
+        model = type(instance)
+        values, relations = {}, {}
+        for name, value in serializer.validated_data.items():
+            field = model._meta.get_field(name)
+            if field.concrete and not field.many_to_many:
+                values[name] = value
+            else:
+                relations[name] = value
+
+        queryset = model._base_manager.filter(pk=instance.pk)
+        if versions is not None:
+            # another update may have won since the instance was read
+            queryset = queryset.filter(version=instance.version)
+        if not queryset.update(version=F('version') + 1, **values):
+            raise PreconditionFailed()
+
+        for name, value in values.items():
+            setattr(instance, name, value)
+        for name, value in relations.items():
+            getattr(instance, name).set(value)
+        instance.version += 1
@@ -0,0 +1,93 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+
+def _sha256(*parts):
+    return hashlib.sha256('\n'.join(parts).encode()).hexdigest()
+
+
+class IdempotentPostMixin:
+    """ Replay the stored response of a POST request retried with the same
+        Idempotency-Key header, instead of running it again.
+        Keys are scoped to the client and the path. Only successful
+        responses are stored, for IDEMPOTENCY_KEY_TTL. While the request
+        runs, its key only holds for IDEMPOTENCY_KEY_LEASE, so a key left
+        by a crashed worker does not block the retries for long.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if request.method == 'POST' and key:
+            self.post = self.idempotent(self.post, key)
+
+    def idempotency_scope(self, request):
+        if request.user and request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return f"ip:{request.META.get('REMOTE_ADDR', '')}"
+
+    def idempotent(self, handler, key):
+        def wrapper(request, *args, **kwargs):
+            digest = _sha256(self.idempotency_scope(request), request.path,
+                             key)
+            fingerprint = _sha256(json.dumps(request.data, sort_keys=True,
+                                             default=str))
+            now = timezone.now()
+            record = IdempotencyKey.objects.filter(digest=digest).first()
+            if record is not None and record.expires_at > now:
+                return self.replay(record, fingerprint)
+            if record is not None:
+                record.delete()
+            try:
+                with transaction.atomic():
+                    record = IdempotencyKey.objects.create(
+                        digest=digest, fingerprint=fingerprint,
+                        expires_at=now + settings.IDEMPOTENCY_KEY_LEASE)
+            except IntegrityError:
+                # The same request arrived in between
+                return self.replay(
+                    IdempotencyKey.objects.get(digest=digest), fingerprint)
+
+            try:
+                response = handler(request, *args, **kwargs)
+            except Exception:
+                record.delete()
+                raise
+            if not status.is_success(response.status_code):
+                record.delete()
+                return response
+
+            record.status_code = response.status_code
+            record.response = json.loads(
+                JSONRenderer().render(response.data) or 'null')
+            record.expires_at = (timezone.now()
+                                 + settings.IDEMPOTENCY_KEY_TTL)
+            record.save(update_fields=['status_code', 'response',
+                                       'expires_at'])
+            return response
+        return wrapper
+
+    def replay(self, record, fingerprint):
+        if record.fingerprint != fingerprint:
+            return Response(
+                {"detail": f"This {IDEMPOTENCY_HEADER} was used with "
+                           "another payload."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        if record.status_code is None:
+            return Response(
+                {"detail": "A request with this "
+                           f"{IDEMPOTENCY_HEADER} is in progress."},
+                status=status.HTTP_409_CONFLICT)
+        return Response(record.response, status=record.status_code,
+                        headers={'Idempotent-Replayed': 'true'})
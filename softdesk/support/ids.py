@@ -0,0 +1,57 @@
+import os
+import threading
+import time
+import uuid
+
+
+class Uuid7Generator:
+    """ Generate time ordered UUIDs (RFC 9562 version 7).
+        The first 48 bits hold the unix time in milliseconds, so new ids
+        are appended at the end of the primary key index instead of being
+        scattered across it. Within the same millisecond a 12 bit counter
+        keeps the ids of a generator increasing.
+    """
+
+    def __init__(self, random_bytes=os.urandom):
+        """ Args:
+                random_bytes (callable): source of the random bits, given a
+                    number of bytes, a seeded one gives reproducible ids
+        """
+        self.random_bytes = random_bytes
+        self.lock = threading.Lock()
+        self.last_ms = 0
+        self.counter = 0
+
+    def __call__(self, timestamp_ms=None):
+        """ Return the next id
+            Args:
+                timestamp_ms (int): time to encode, default is now
+        """
+        random_bits = int.from_bytes(self.random_bytes(8), 'big')
+        if timestamp_ms is None:
+            timestamp_ms = time.time_ns() // 1_000_000
+        with self.lock:
+            if timestamp_ms > self.last_ms:
+                self.last_ms = timestamp_ms
+                self.counter = random_bits >> 53
+            else:
+                # Same millisecond or clock going back, keep counting
+                self.counter += 1
+                if self.counter > 0xFFF:
+                    self.last_ms += 1
+                    self.counter = 0
+            timestamp_ms, counter = self.last_ms, self.counter
+
+        return uuid.UUID(int=(timestamp_ms & 0xFFFFFFFFFFFF) << 80
+                         | 0x7 << 76
+                         | counter << 64
+                         | 0b10 << 62
+                         | random_bits & 0x3FFFFFFFFFFFFFFF)
+
+
+_generator = Uuid7Generator()
+
+
+def uuid7():
+    """ Return a time ordered UUID, default of the comment primary key """
+    return _generator()
@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from support.archive import ARCHIVE_BATCH_SIZE, archive_issues
+
+
+class Command(BaseCommand):
+    help = "Move old finished issues and their comments to the archive"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int,
+                            default=settings.ISSUE_ARCHIVE_AFTER.days,
+                            help="Archive finished issues older than this")
+        parser.add_argument('--batch-size', type=int,
+                            default=ARCHIVE_BATCH_SIZE,
+                            help="Maximum number of issues moved at once")
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        for progress in archive_issues(before, options['batch_size']):
+            self.stdout.write(
+                f"{progress['issues']} issues, "
+                f"{progress['comments']} comments archived"
+                + (" (done)" if progress['done'] else ""))
@@ -0,0 +1,51 @@
+import sqlite3
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from support.ids import uuid7
+
+
+class Command(BaseCommand):
+    help = ("Benchmark comment insert throughput with random (v4) and time "
+            "ordered (v7) UUID primary keys, on a scratch SQLite file with "
+            "the comment table layout")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500_000)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def insert(self, path, generate, rows, batch_size):
+        db = sqlite3.connect(path)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA cache_size=-8000')
+        db.execute('CREATE TABLE comment (id char(32) NOT NULL PRIMARY KEY,'
+                   ' issue_id bigint NOT NULL, author_id bigint NULL,'
+                   ' description text NOT NULL,'
+                   ' created_time datetime NOT NULL)')
+        start = time.perf_counter()
+        for offset in range(0, rows, batch_size):
+            db.executemany(
+                'INSERT INTO comment VALUES (?, ?, ?, ?, ?)',
+                [(generate().hex, index % 1000, 1, 'comment',
+                  '2026-01-01 00:00:00')
+                 for index in range(offset, min(rows, offset + batch_size))])
+            db.commit()
+        elapsed = time.perf_counter() - start
+        pages = db.execute('PRAGMA page_count').fetchone()[0]
+        db.close()
+        return elapsed, pages
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        self.stdout.write(f"{'ids':<12}{'rows/s':>12}{'pages':>10}")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name, generate in (('uuid4', uuid.uuid4), ('uuid7', uuid7)):
+                elapsed, pages = self.insert(
+                    str(Path(tmpdir) / f'{name}.sqlite3'), generate, rows,
+                    options['batch_size'])
+                self.stdout.write(f"{name:<12}{rows / elapsed:>12.0f}"
+                                  f"{pages:>10}")
@@ -0,0 +1,77 @@
+import json
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.middleware.gzip import GZipMiddleware
+from django.utils.text import compress_string
+
+WORDS = ('the issue fails when the user opens the project page after login '
+         'status priority backend frontend android ios crash error timeout '
+         'expected result actual result steps to reproduce version build '
+         'server client request response cache database query slow').split()
+
+
+class Command(BaseCommand):
+    help = ("Benchmark the gzip compression of the middleware on issue list "
+            "bodies of growing size: bytes saved and CPU time per response, "
+            "to choose RESPONSE_COMPRESSION['MIN_SIZE']")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+',
+                            default=[128, 256, 512, 1024, 2048, 4096, 16384,
+                                     65536],
+                            help="Body sizes in bytes")
+        parser.add_argument('--rounds', type=int, default=200)
+
+    def issue_page(self, page_size):
+        randomizer = random.Random(42)
+
+        def text(length):
+            words = []
+            while sum(len(word) + 1 for word in words) < length:
+                words.append(randomizer.choice(WORDS))
+            return ' '.join(words)[:length]
+
+        return json.dumps({
+            'count': page_size * 10,
+            'next': 'http://testserver/projects/1/issues/?page=2',
+            'previous': None,
+            'results': [{
+                'id': index,
+                'author': randomizer.randint(1, 500),
+                'project': 1,
+                'assigned_to': randomizer.randint(1, 500),
+                'name': text(60),
+                'description': text(2048),
+                'priority': randomizer.choice(['low', 'medium', 'high']),
+                'type': randomizer.choice(['bug', 'feature', 'task']),
+                'status': randomizer.choice(['todo', 'progress',
+                                             'finished']),
+                'created_time': '2026-01-29T08:13:00.000000Z',
+                'comments': [],
+            } for index in range(page_size)],
+        }).encode()
+
+    def handle(self, *args, **options):
+        """ Compress each body as GZipMiddleware does, at its fixed level 6
+            with the random padding of the gzip header """
+        sizes = sorted(options['sizes'])
+        page = self.issue_page(settings.REST_FRAMEWORK['MAX_PAGE_SIZE'])
+        while len(page) < sizes[-1]:
+            page += page
+        min_size = settings.RESPONSE_COMPRESSION['MIN_SIZE']
+        self.stdout.write(f"{'bytes':>8}{'gzip':>8}{'saved':>8}"
+                          f"{'ms/response':>14}  compressed")
+        for size in sizes:
+            body = page[:size]
+            start = time.perf_counter()
+            for _ in range(options['rounds']):
+                compressed = compress_string(
+                    body, max_random_bytes=GZipMiddleware.max_random_bytes)
+            elapsed = (time.perf_counter() - start) / options['rounds']
+            self.stdout.write(
+                f"{size:>8}{len(compressed):>8}"
+                f"{size - len(compressed):>8}{elapsed * 1000:>14.3f}  "
+                f"{'yes' if size >= min_size else 'no'}")
@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from authentication.models import CustomUser
+from support.models import Project
+from support.views import IssueViewSet
+
+
+class Command(BaseCommand):
+    help = "Benchmark the issue creation throughput and queries per create"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+
+    def measure(self, request, project, count):
+        view = IssueViewSet.as_view({'post': 'create'},
+                                    throttle_classes=[])
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for _ in range(count):
+                response = view(request, project_id=project.pk)
+                assert response.status_code == 201, response.data
+            elapsed = time.perf_counter() - start
+        return count / elapsed, len(queries) / count
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        factory = APIRequestFactory()
+        # Rows are created in a transaction rolled back at the end
+        with transaction.atomic():
+            author = CustomUser.objects.create(username='bench-issue-author',
+                                               age=30)
+            assignee = CustomUser.objects.create(
+                username='bench-issue-assignee', age=30)
+            project = Project.objects.create(
+                author=author, name='bench', description='bench',
+                type='backend')
+            project.contributors.add(author, assignee)
+
+            self.stdout.write(f"{'payload':<20}{'creates/s':>12}"
+                              f"{'queries':>9}")
+            for name, assigned_to in (('unassigned', None),
+                                      ('assigned', assignee.pk)):
+                payload = {'name': 'Issue', 'description': 'Description',
+                           'priority': 'low', 'type': 'bug',
+                           'comments': []}
+                if assigned_to:
+                    payload['assigned_to'] = assigned_to
+                request = factory.post(
+                    f'/projects/{project.pk}/issues/', payload,
+                    format='json')
+                force_authenticate(request, user=author)
+                rate, queries = self.measure(request, project, count)
+                self.stdout.write(f"{name:<20}{rate:>12.0f}{queries:>9.2f}")
+            transaction.set_rollback(True)
@@ -0,0 +1,54 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Boot a worker like gunicorn does, then load the URLconf like the first
+# request does
+WORKER_BOOT = '''
+import json, resource, sys, time
+start = time.perf_counter()
+from softdesk.wsgi import application
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({
+    'seconds': time.perf_counter() - start,
+    'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules': len(sys.modules),
+}))
+'''
+
+
+class Command(BaseCommand):
+    help = ("Benchmark the boot of a worker: import time, resident memory "
+            "and imported modules per settings profile")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--settings-modules', nargs='+',
+                            default=['softdesk.settings',
+                                     'softdesk.settings_production'])
+        parser.add_argument('--runs', type=int, default=5)
+
+    def boot(self, settings_module):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module}
+        output = subprocess.run(
+            [sys.executable, '-c', WORKER_BOOT], env=env,
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+            check=True).stdout
+        return json.loads(output.splitlines()[-1])
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'settings':<32}{'boot ms':>10}{'RSS MB':>10}"
+                          f"{'modules':>10}")
+        for settings_module in options['settings_modules']:
+            boots = [self.boot(settings_module)
+                     for _ in range(options['runs'])]
+            seconds = statistics.median(boot['seconds'] for boot in boots)
+            rss = statistics.median(boot['rss_kb'] for boot in boots)
+            modules = boots[0]['modules']
+            self.stdout.write(f"{settings_module:<32}{seconds * 1000:>10.0f}"
+                              f"{rss / 1024:>10.1f}{modules:>10}")
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from softdesk.schema import artifact_path, dump_schema, generate_schema, \
+    load_schema
+
+
+class Command(BaseCommand):
+    help = ("Pre-generate the OpenAPI schema served at api/schema/, or check "
+            "that the built schema matches the code")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help="Fail when the artifact is missing or out "
+                                 "of date instead of writing it")
+
+    def handle(self, *args, **options):
+        path = artifact_path()
+        schema = generate_schema()
+        if options['check']:
+            if load_schema() != schema:
+                raise CommandError(
+                    f"{path} is out of date, run `python manage.py "
+                    f"build_schema`")
+            self.stdout.write(f"{path} is up to date")
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(dump_schema(schema))
+        self.stdout.write(f"Schema written to {path}")
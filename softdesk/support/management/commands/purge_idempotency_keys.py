@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from support.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Delete expired idempotency keys"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Maximum number of rows deleted at once")
+
+    def handle(self, *args, **options):
+        expired = IdempotencyKey.objects.filter(
+            expires_at__lte=timezone.now())
+        deleted = 0
+        while True:
+            ids = list(expired.values_list('pk', flat=True)
+                       [:options['batch_size']])
+            if not ids:
+                break
+            IdempotencyKey.objects.filter(pk__in=ids).delete()
+            deleted += len(ids)
+        self.stdout.write(f"{deleted} expired idempotency keys deleted")
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from support.models import Project
+from support.purge import PURGE_BATCH_SIZE, purge_project
+
+
+class Command(BaseCommand):
+    help = "Hard delete soft deleted projects with their issues and comments"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int,
+                            default=PURGE_BATCH_SIZE,
+                            help="Maximum number of rows deleted at once")
+
+    def handle(self, *args, **options):
+        project_ids = (Project.all_objects.deleted()
+                       .values_list('id', flat=True))
+        for project_id in list(project_ids):
+            for progress in purge_project(project_id,
+                                          options['batch_size']):
+                self.stdout.write(
+                    f"project {progress['project']}: "
+                    f"{progress['comments']} comments, "
+                    f"{progress['issues']} issues deleted"
+                    + (" (done)" if progress['done'] else ""))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from support.ids import Uuid7Generator
+from support.models import Comment
+
+
+class Command(BaseCommand):
+    help = ("Give the comments created before time ordered ids a version 7 "
+            "id built from their creation time. Their old ids, and the "
+            "URLs built on them, stop working.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Number of comments updated per "
+                                 "transaction")
+
+    def rekey(self, batch):
+        with transaction.atomic():
+            for pk, created_time in batch:
+                new_pk = self.generate(int(created_time.timestamp() * 1000))
+                Comment.objects.filter(pk=pk).update(id=new_pk)
+
+    def handle(self, *args, **options):
+        # Comments are read in creation order, so their new ids follow it
+        self.generate = Uuid7Generator()
+        comments = (Comment.objects.order_by('created_time', 'id')
+                    .values_list('id', 'created_time')
+                    .iterator(chunk_size=options['batch_size']))
+        batch = []
+        updated = 0
+        for pk, created_time in comments:
+            if pk.version == 7:
+                continue
+            batch.append((pk, created_time))
+            if len(batch) == options['batch_size']:
+                self.rekey(batch)
+                updated += len(batch)
+                batch = []
+                self.stdout.write(f"{updated} comments rekeyed")
+        self.rekey(batch)
+        updated += len(batch)
+        self.stdout.write(f"{updated} comments rekeyed")
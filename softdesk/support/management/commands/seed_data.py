@@ -0,0 +1,234 @@
+import random
+import time
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from support.ids import Uuid7Generator
+from support.models import Project, Issue, Comment
+
+User = get_user_model()
+
+WORDS = ('login', 'page', 'button', 'crash', 'slow', 'export', 'report',
+         'mobile', 'api', 'token', 'search', 'filter', 'upload', 'email',
+         'layout', 'timeout', 'cache', 'payment', 'profile', 'settings')
+
+
+@contextmanager
+def explicit_created_time(*models):
+    """ Let bulk_create store the created_time of the objects instead of
+        the current time of auto_now_add.
+        The flag is switched on the fields shared by the whole process, so
+        every save of these models in the meantime, in any thread, keeps
+        its own created_time: only use it in a standalone command.
+    """
+    fields = [model._meta.get_field('created_time') for model in models]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = ("Fill the database with generated users, projects, issues and "
+            "comments for benchmarks. The same seed and prefix generate the "
+            "same rows: project sizes and activity follow a Zipf law, a few "
+            "hot issues get most of the comments.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--projects', type=int, default=100)
+        parser.add_argument('--issues', type=int, default=10_000)
+        parser.add_argument('--comments', type=int, default=100_000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--start', type=datetime.fromisoformat,
+                            default=datetime(2024, 1, 1),
+                            help="Date of the first generated row")
+        parser.add_argument('--days', type=int, default=730,
+                            help="Time span of the generated rows")
+        parser.add_argument('--prefix', default='seed',
+                            help="Prefix of the generated usernames")
+        parser.add_argument('--password', default='seed-password',
+                            help="Password of every generated user")
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if not connection.features.can_return_rows_from_bulk_insert:
+            raise CommandError("The database does not return the ids of "
+                               "bulk inserted rows")
+        for name in ('users', 'projects', 'issues', 'comments', 'days',
+                     'batch_size'):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be "
+                                   f"positive")
+        if User.objects.filter(
+                username__startswith=f"{options['prefix']}-").exists():
+            raise CommandError(f"Users prefixed {options['prefix']}- "
+                               f"already exist, pick another --prefix")
+
+        # The prefix is part of the seed, so that a second run with another
+        # prefix does not generate the same comment ids
+        self.rng = random.Random(f"{options['prefix']}-{options['seed']}")
+        self.batch_size = options['batch_size']
+        start = options['start']
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        self.start_ms = int(start.timestamp() * 1000)
+        self.end_ms = self.start_ms + options['days'] * 86_400_000
+
+        models = (Project, Issue, Comment)
+        with transaction.atomic(), explicit_created_time(*models):
+            users = self.seed_users(options['users'], options['prefix'],
+                                    options['password'])
+            projects = self.seed_projects(options['projects'], users)
+            issues = self.seed_issues(options['issues'], projects)
+            self.seed_comments(options['comments'], projects, issues)
+
+    def report(self, name, rows, started):
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"{rows} {name} in {elapsed:.1f}s "
+                          f"({rows / max(elapsed, 1e-6):.0f} rows/s)")
+
+    @staticmethod
+    def as_datetime(timestamp_ms):
+        return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc)
+
+    def sorted_times(self, count, start_ms, end_ms):
+        return sorted(self.rng.randrange(start_ms, end_ms)
+                      for _ in range(count))
+
+    def text(self, low, high):
+        return ' '.join(self.rng.choices(WORDS, k=self.rng.randint(low,
+                                                                   high)))
+
+    def bulk_create(self, model, objs):
+        """ Insert the objects in batches
+            Returns:
+                list: the ids of the inserted rows
+        """
+        ids = []
+        for offset in range(0, len(objs), self.batch_size):
+            created = model.objects.bulk_create(
+                objs[offset:offset + self.batch_size])
+            ids.extend(obj.pk for obj in created)
+        return ids
+
+    def seed_users(self, count, prefix, password):
+        """ Users sharing one password hash, hashed once """
+        started = time.perf_counter()
+        password = make_password(password)
+        ids = self.bulk_create(User, [
+            User(username=f'{prefix}-{index}', password=password,
+                 first_name=prefix, last_name=str(index),
+                 age=self.rng.randint(18, 70),
+                 can_be_contacted=self.rng.random() < 0.5,
+                 can_data_be_shared=self.rng.random() < 0.3)
+            for index in range(count)])
+        self.report('users', count, started)
+        return ids
+
+    def seed_projects(self, count, users):
+        """ Projects with their contributors, created in the 90 days before
+            the first issue. The first ones are the most active and have
+            the most contributors
+            Returns:
+                list: (id, contributor ids, Zipf weight) of each project
+        """
+        started = time.perf_counter()
+        sizes = sorted((min(len(users),
+                            1 + int(self.rng.paretovariate(1.2) * 2))
+                        for _ in range(count)), reverse=True)
+        members = [self.rng.sample(users, size) for size in sizes]
+        times = self.sorted_times(count, self.start_ms - 90 * 86_400_000,
+                                  self.start_ms)
+        ids = self.bulk_create(Project, [
+            Project(author_id=contributors[0],
+                    name=f'Project {index} {self.text(1, 3)}',
+                    description=self.text(5, 30),
+                    type=self.rng.choice(Project.TYPE_CHOICES)[0],
+                    created_time=self.as_datetime(created_ms))
+            for index, (contributors, created_ms)
+            in enumerate(zip(members, times))])
+        self.report('projects', count, started)
+
+        started = time.perf_counter()
+        through = Project.contributors.through
+        rows = [through(project_id=project_id, customuser_id=user_id)
+                for project_id, contributors in zip(ids, members)
+                for user_id in contributors]
+        self.bulk_create(through, rows)
+        self.report('contributors', len(rows), started)
+        return [(project_id, contributors, 1 / (rank + 1) ** 1.1)
+                for rank, (project_id, contributors)
+                in enumerate(zip(ids, members))]
+
+    def seed_issues(self, count, projects):
+        """ Issues spread over the projects by their Zipf weight, the older
+            an issue the more likely it is finished
+            Returns:
+                list: (id, project, created time in ms) of each issue
+        """
+        started = time.perf_counter()
+        span = self.end_ms - self.start_ms
+        times = self.sorted_times(count, self.start_ms, self.end_ms)
+        owners = self.rng.choices(
+            range(len(projects)),
+            cum_weights=list(accumulate(weight for *_, weight in projects)),
+            k=count)
+        objs = []
+        for created_ms, owner in zip(times, owners):
+            project_id, contributors, _ = projects[owner]
+            age = (self.end_ms - created_ms) / span
+            objs.append(Issue(
+                project_id=project_id,
+                author_id=self.rng.choice(contributors),
+                assigned_to_id=(self.rng.choice(contributors)
+                                if self.rng.random() < 0.7 else None),
+                name=self.text(2, 6).capitalize(),
+                description=self.text(5, 60),
+                priority=self.rng.choices(('low', 'medium', 'high'),
+                                          weights=(50, 35, 15))[0],
+                type=self.rng.choices(('bug', 'feature', 'task'),
+                                      weights=(45, 35, 20))[0],
+                status=self.rng.choices(
+                    ('todo', 'progress', 'finished'),
+                    weights=((1 - age) * 0.85, 0.15, age * 0.85))[0],
+                created_time=self.as_datetime(created_ms)))
+        ids = self.bulk_create(Issue, objs)
+        self.report('issues', count, started)
+        return list(zip(ids, owners, times))
+
+    def seed_comments(self, count, projects, issues):
+        """ Comments in time order on the issues created before them, an
+            issue is picked by its Pareto distributed heat """
+        started = time.perf_counter()
+        heat = list(accumulate(self.rng.paretovariate(1.5) for _ in issues))
+        issue_times = [created_ms for *_, created_ms in issues]
+        generate = Uuid7Generator(self.rng.randbytes)
+        objs = []
+        for created_ms in self.sorted_times(count, issue_times[0],
+                                            self.end_ms):
+            eligible = bisect_right(issue_times, created_ms)
+            index = bisect_left(heat, self.rng.random() * heat[eligible - 1],
+                                0, eligible)
+            issue_id, owner, _ = issues[index]
+            objs.append(Comment(
+                id=generate(created_ms),
+                issue_id=issue_id,
+                author_id=self.rng.choice(projects[owner][1]),
+                description=self.text(3, 40),
+                created_time=self.as_datetime(created_ms)))
+            if len(objs) == self.batch_size:
+                Comment.objects.bulk_create(objs)
+                objs = []
+        Comment.objects.bulk_create(objs)
+        self.report('comments', count, started)
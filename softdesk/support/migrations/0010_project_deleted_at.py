@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('support', '0009_alter_project_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:19
+
+import support.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('support', '0012_comment_thread_ordering'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='id',
+            field=models.UUIDField(default=support.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
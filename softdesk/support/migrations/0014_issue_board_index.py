@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('support', '0013_comment_uuid7'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['project', 'status', '-created_time', '-id'], name='issue_board_idx'),
+        ),
+    ]
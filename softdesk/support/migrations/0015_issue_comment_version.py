@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('support', '0014_issue_board_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('support', '0015_issue_comment_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedIssue',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=200)),
+                ('description', models.TextField(max_length=2048)),
+                ('priority', models.CharField(choices=[('low', 'low'), ('medium', 'medium'), ('high', 'high')], max_length=20)),
+                ('type', models.CharField(choices=[('bug', 'bug'), ('feature', 'feature'), ('task', 'task')], max_length=20)),
+                ('status', models.CharField(choices=[('todo', 'to do'), ('progress', 'in progress'), ('finished', 'finished')], max_length=20)),
+                ('created_time', models.DateTimeField()),
+                ('version', models.PositiveIntegerField()),
+                ('archived_time', models.DateTimeField(auto_now_add=True)),
+                ('assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('author', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_issues', to='support.project')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedComment',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('description', models.TextField(max_length=2048)),
+                ('created_time', models.DateTimeField()),
+                ('version', models.PositiveIntegerField()),
+                ('author', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('issue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='support.archivedissue')),
+            ],
+            options={
+                'ordering': ['created_time', 'id'],
+                'indexes': [models.Index(fields=['issue', 'created_time', 'id'], name='archived_comment_thread_idx')],
+            },
+        ),
+    ]
@@ -1,11 +1,29 @@
-import uuid
-
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
+
+from .ids import uuid7
 
 User = get_user_model()
 
 
+class ProjectQuerySet(models.QuerySet):
+    """ QuerySet helpers for project soft deletion """
+
+    def alive(self):
+        return self.filter(deleted_at__isnull=True)
+
+    def deleted(self):
+        return self.filter(deleted_at__isnull=False)
+
+
+class ProjectManager(models.Manager.from_queryset(ProjectQuerySet)):
+    """ Default manager hiding soft deleted projects """
+
+    def get_queryset(self):
+        return super().get_queryset().alive()
+
+
 class Project(models.Model):
     """ Project model """
     TYPE_CHOICES = (
@@ -21,6 +39,11 @@ class Project(models.Model):
     created_time = models.DateTimeField(auto_now_add=True)
     contributors = models.ManyToManyField(User,
                                           related_name='projects', blank=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True,
+                                      editable=False)
+
+    objects = ProjectManager()
+    all_objects = ProjectQuerySet.as_manager()
 
     class Meta:
         ordering = ["id"]
@@ -28,6 +51,11 @@ class Project(models.Model):
     def __str__(self):
         return f'{self.name} ({self.type}) du {self.created_time}'
 
+    def soft_delete(self):
+        """ Hide the project right away, rows are purged later """
+        self.deleted_at = timezone.now()
+        self.save(update_fields=['deleted_at'])
+
 
 class Issue(models.Model):
     """ Issue model """
@@ -60,6 +88,16 @@ class Issue(models.Model):
                                     related_name='assigned_issues',
                                     null=True, blank=True)
     created_time = models.DateTimeField(auto_now_add=True)
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    archived = False
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["project", "status", "-created_time",
+                                 "-id"],
+                         name="issue_board_idx"),
+        ]
 
     def __str__(self):
         return f'{self.name} ({self.type}) du {self.created_time}'
@@ -69,7 +107,7 @@ class Comment(models.Model):
     """ Comment model """
     id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False
     )
     issue = models.ForeignKey(
@@ -80,6 +118,84 @@ class Comment(models.Model):
                                null=True, related_name='comments')
     description = models.TextField(max_length=2048)
     created_time = models.DateTimeField(auto_now_add=True)
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    archived = False
+
+    class Meta:
+        ordering = ["created_time", "id"]
+        indexes = [
+            models.Index(fields=["issue", "created_time", "id"],
+                         name="comment_thread_idx"),
+        ]
+
+    def __str__(self):
+        return f'{self.issue} by ({self.author}) on {self.created_time}'
+
+
+class ArchivedIssue(models.Model):
+    """ Old finished issue moved out of the issue table, read only.
+        The row keeps the id and the values it had as an issue.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    author = models.ForeignKey(to=User, on_delete=models.SET_NULL, null=True,
+                               related_name='+')
+    project = models.ForeignKey(to=Project, on_delete=models.CASCADE,
+                                related_name='archived_issues')
+    name = models.CharField(max_length=200)
+    description = models.TextField(max_length=2048)
+    priority = models.CharField(max_length=20,
+                                choices=Issue.PRIORITY_CHOICES)
+    type = models.CharField(max_length=20, choices=Issue.TYPE_CHOICES)
+    status = models.CharField(max_length=20, choices=Issue.STATUS_CHOICES)
+    assigned_to = models.ForeignKey(to=User, on_delete=models.SET_NULL,
+                                    related_name='+', null=True, blank=True)
+    created_time = models.DateTimeField()
+    version = models.PositiveIntegerField()
+    archived_time = models.DateTimeField(auto_now_add=True)
+
+    archived = True
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self):
+        return f'{self.name} ({self.type}) du {self.created_time}'
+
+
+class ArchivedComment(models.Model):
+    """ Comment of an archived issue, read only """
+    id = models.UUIDField(primary_key=True)
+    issue = models.ForeignKey(
+        to=ArchivedIssue,
+        on_delete=models.CASCADE,
+        related_name='comments')
+    author = models.ForeignKey(to=User, on_delete=models.SET_NULL,
+                               null=True, related_name='+')
+    description = models.TextField(max_length=2048)
+    created_time = models.DateTimeField()
+    version = models.PositiveIntegerField()
+
+    archived = True
+
+    class Meta:
+        ordering = ["created_time", "id"]
+        indexes = [
+            models.Index(fields=["issue", "created_time", "id"],
+                         name="archived_comment_thread_idx"),
+        ]
 
     def __str__(self):
         return f'{self.issue} by ({self.author}) on {self.created_time}'
+
+
+class IdempotencyKey(models.Model):
+    """ Response of a POST request sent with an Idempotency-Key header """
+    digest = models.CharField(max_length=64, unique=True)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response = models.JSONField(null=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f'{self.digest} ({self.status_code})'
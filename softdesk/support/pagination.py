@@ -0,0 +1,214 @@
+import uuid
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .models import Issue
+
+
+class TimeCursorMixin:
+    """ Page size and opaque cursors on the (created_time, id) position of
+        a row, for the paginators walking an index in time order """
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+    # Type of the primary key in the cursors
+    cursor_pk = int
+
+    def get_page_size(self, request):
+        page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            pass
+        return max(1, min(page_size,
+                          settings.REST_FRAMEWORK['MAX_PAGE_SIZE']))
+
+    @staticmethod
+    def encode_cursor(obj):
+        position = f'{obj.created_time.isoformat()}|{obj.pk}'
+        return urlsafe_b64encode(position.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            created_time, pk = (urlsafe_b64decode(padded.encode())
+                                .decode().split('|'))
+            return datetime.fromisoformat(created_time), self.cursor_pk(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class CommentThreadPagination(TimeCursorMixin, BasePagination):
+    """ Paginate a comment thread in (created_time, id) order.
+        Without parameters the latest comments are returned. The older and
+        newer links page through the thread with opaque cursors, and
+        ?around=<comment id> opens the thread on a given comment. Each page
+        is a single range scan of the (issue, created_time, id) index.
+    """
+    cursor_params = ('before', 'after', 'around')
+    cursor_pk = uuid.UUID
+
+    @staticmethod
+    def newer(queryset, position, limit, inclusive=False):
+        created_time, pk = position
+        pk_lookup = 'pk__gte' if inclusive else 'pk__gt'
+        return list(queryset
+                    .filter(Q(created_time__gt=created_time)
+                            | Q(created_time=created_time,
+                                **{pk_lookup: pk}))
+                    .order_by('created_time', 'id')[:limit])
+
+    @staticmethod
+    def older(queryset, position, limit):
+        if position is not None:
+            created_time, pk = position
+            queryset = queryset.filter(
+                Q(created_time__lt=created_time)
+                | Q(created_time=created_time, pk__lt=pk))
+        return list(queryset.order_by('-created_time', '-id')[:limit])[::-1]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        size = self.get_page_size(request)
+        params = request.query_params
+
+        if params.get('around'):
+            try:
+                around = self.cursor_pk(params['around'])
+            except ValueError:
+                raise NotFound(self.invalid_cursor_message)
+            anchor = (queryset.filter(pk=around)
+                      .values_list('created_time', 'id').first())
+            if anchor is None:
+                raise NotFound(self.invalid_cursor_message)
+            older = self.older(queryset, anchor, size // 2 + 1)
+            self.has_older = len(older) > size // 2
+            older = older[1:] if self.has_older else older
+            comments = older + self.newer(queryset, anchor,
+                                          size - len(older), inclusive=True)
+        elif params.get('after'):
+            comments = self.newer(queryset,
+                                  self.decode_cursor(params['after']), size)
+            self.has_older = True
+        else:
+            position = None
+            if params.get('before'):
+                position = self.decode_cursor(params['before'])
+            comments = self.older(queryset, position, size + 1)
+            self.has_older = len(comments) > size
+            comments = comments[1:] if self.has_older else comments
+
+        self.first = comments[0] if comments else None
+        self.last = comments[-1] if comments else None
+        return comments
+
+    def get_link(self, param, cursor):
+        url = self.request.build_absolute_uri()
+        for other in self.cursor_params:
+            url = remove_query_param(url, other)
+        return replace_query_param(url, param, cursor)
+
+    def get_older_link(self):
+        if not self.has_older or self.first is None:
+            return None
+        return self.get_link('before', self.encode_cursor(self.first))
+
+    def get_newer_link(self):
+        """ Always given, so clients can poll for new comments """
+        if self.last is None:
+            return self.request.build_absolute_uri()
+        return self.get_link('after', self.encode_cursor(self.last))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'older': self.get_older_link(),
+            'newer': self.get_newer_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'older': {'type': 'string', 'nullable': True,
+                          'format': 'uri'},
+                'newer': {'type': 'string', 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class IssueBoardPagination(TimeCursorMixin, BasePagination):
+    """ Paginate issues by status column, newest first.
+        Without parameters the first page and the count of every column are
+        read by one query ranking the issues with ROW_NUMBER() OVER
+        (PARTITION BY status). The next link of a column pages through it
+        alone with ?status=<status>&cursor=<cursor>; the count is only given
+        on the first page.
+    """
+    columns = [status for status, _ in Issue.STATUS_CHOICES]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.size = self.get_page_size(request)
+        params = request.query_params
+        self.columns_shown = self.columns
+        self.cursor = params.get('cursor')
+
+        if params.get('status') is not None:
+            if params['status'] not in self.columns:
+                raise ValidationError({'status': 'Unknown status'})
+            self.columns_shown = [params['status']]
+            queryset = queryset.filter(status=params['status'])
+        elif self.cursor:
+            raise ValidationError({'status': 'A cursor needs a status'})
+        if self.cursor:
+            created_time, pk = self.decode_cursor(self.cursor)
+            queryset = queryset.filter(
+                Q(created_time__lt=created_time)
+                | Q(created_time=created_time, pk__lt=pk))
+
+        newest_first = (F('created_time').desc(), F('id').desc())
+        issues = list(queryset.annotate(
+            column_rank=Window(RowNumber(), partition_by=F('status'),
+                               order_by=newest_first),
+            column_count=Window(Count('id'), partition_by=F('status')),
+        ).filter(column_rank__lte=self.size + 1).order_by(*newest_first))
+
+        self.pages = {status: [] for status in self.columns_shown}
+        self.counts = {status: 0 for status in self.columns_shown}
+        self.has_next = {}
+        for issue in issues:
+            self.pages[issue.status].append(issue)
+            self.counts[issue.status] = issue.column_count
+        for status, page in self.pages.items():
+            self.has_next[status] = len(page) > self.size
+            del page[self.size:]
+        return [issue for page in self.pages.values() for issue in page]
+
+    def get_next_link(self, status):
+        if not self.has_next[status]:
+            return None
+        url = replace_query_param(self.request.build_absolute_uri(),
+                                  'status', status)
+        return replace_query_param(
+            url, 'cursor', self.encode_cursor(self.pages[status][-1]))
+
+    def get_paginated_response(self, data):
+        results = iter(data)
+        return Response({
+            status: {
+                'count': None if self.cursor else self.counts[status],
+                'next': self.get_next_link(status),
+                'results': [next(results) for _ in page],
+            }
+            for status, page in self.pages.items()
+        })
@@ -0,0 +1,61 @@
+from rest_framework import permissions
+
+from .models import Project
+
+
+class ProjectAccess:
+    """ Resolve the membership of a user in a project when no object of
+        the project is loaded yet. The author of a project the user
+        contributes to is queried by project id the first time a request
+        needs it, then compared without any query.
+    """
+    def __init__(self, user):
+        self.user_id = user.pk
+        self._authors = {}
+
+    @classmethod
+    def for_request(cls, request):
+        """ Return the access of the request user, built once per request """
+        access = getattr(request, '_project_access', None)
+        if access is None or access.user_id != request.user.pk:
+            access = cls(request.user)
+            request._project_access = access
+        return access
+
+    def author_id(self, project_id):
+        """ Author id of the project, None when the user does not
+            contribute to it """
+        project_id = int(project_id)
+        if project_id not in self._authors:
+            self._authors[project_id] = (
+                Project.objects.filter(pk=project_id,
+                                       contributors=self.user_id)
+                .values_list('author_id', flat=True).first())
+        return self._authors[project_id]
+
+    def is_contributor(self, project_id):
+        return self.author_id(project_id) is not None
+
+    def is_project_author(self, project_id):
+        return self.author_id(project_id) == self.user_id
+
+
+class IsAuthorOrContributor(permissions.BasePermission):
+    """Allows reading to contributors and editing to authors only.
+    The viewsets only load the objects of the projects the user contributes
+    to, so the membership is already checked and no query is needed.
+    """
+    def has_object_permission(self, request, view, obj):
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        return obj.author_id == request.user.pk
+
+
+class IsProjectAuthor(permissions.BasePermission):
+    """Allows access only to project authors"""
+    def has_permission(self, request, view):
+        project_id = view.kwargs.get('project_id')
+        if not project_id:
+            return False
+        return ProjectAccess.for_request(request).is_project_author(
+            project_id)
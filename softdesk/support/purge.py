@@ -0,0 +1,56 @@
+from .models import Project, Issue, Comment, ArchivedIssue, \
+    ArchivedComment
+
+PURGE_BATCH_SIZE = 500
+
+
+def _delete_batch(queryset, batch_size):
+    """ Delete at most batch_size rows of the queryset
+        Args:
+            queryset (QuerySet): rows to delete
+            batch_size (int): maximum number of rows deleted at once
+        Returns:
+            int: number of deleted rows
+    """
+    ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+    if not ids:
+        return 0
+    queryset.model.objects.filter(pk__in=ids).delete()
+    return len(ids)
+
+
+def purge_project(project_id, batch_size=PURGE_BATCH_SIZE):
+    """ Hard delete a soft deleted project in bounded batches.
+        Comments go first, then issues, live then archived, then the
+        project row itself, so every DELETE statement only touches
+        batch_size rows.
+        Args:
+            project_id (int): id of the soft deleted project
+            batch_size (int): maximum number of rows deleted per statement
+        Yields:
+            dict: progress with the number of rows deleted so far
+    """
+    progress = {'project': project_id, 'comments': 0, 'issues': 0,
+                'done': False}
+    if not Project.all_objects.deleted().filter(pk=project_id).exists():
+        return
+    comments = Comment.objects.filter(issue__project_id=project_id)
+    issues = Issue.objects.filter(project_id=project_id)
+    archived_comments = ArchivedComment.objects.filter(
+        issue__project_id=project_id)
+    archived_issues = ArchivedIssue.objects.filter(project_id=project_id)
+
+    for key, queryset in (('comments', comments),
+                          ('comments', archived_comments),
+                          ('issues', issues),
+                          ('issues', archived_issues)):
+        while True:
+            deleted = _delete_batch(queryset, batch_size)
+            if not deleted:
+                break
+            progress[key] += deleted
+            yield dict(progress)
+
+    Project.all_objects.filter(pk=project_id).delete()
+    progress['done'] = True
+    yield dict(progress)
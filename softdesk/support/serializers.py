@@ -1,12 +1,14 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from softdesk.serializers import UpdateFieldsModelSerializer
 from .models import Project, Issue, Comment
 
 User = get_user_model()
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(UpdateFieldsModelSerializer):
     """ Serializer for project model """
     author = serializers.PrimaryKeyRelatedField(read_only=True)
 
@@ -23,9 +25,48 @@ class ProjectSerializer(serializers.ModelSerializer):
         ]
 
 
+class ProjectSummarySerializer(ProjectSerializer):
+    """ Project with the usernames of its members and its open issue count,
+        read from the annotations and prefetches of ProjectViewSet """
+    author_username = serializers.CharField(source='author.username',
+                                            read_only=True, default=None)
+    contributor_usernames = serializers.SlugRelatedField(
+        source='contributors', slug_field='username', many=True,
+        read_only=True)
+    open_issue_count = serializers.IntegerField(read_only=True)
+
+    class Meta(ProjectSerializer.Meta):
+        fields = ProjectSerializer.Meta.fields + [
+            'author_username',
+            'contributor_usernames',
+            'open_issue_count',
+        ]
+
+
+class ContributorField(serializers.PrimaryKeyRelatedField):
+    """ User id of a project contributor.
+        Ids already known as contributors of the project of the context are
+        not fetched: the membership guarantees the user exists, and the
+        user is returned with all its fields deferred, loaded on first read.
+    """
+    def to_internal_value(self, data):
+        known_members = getattr(self.context.get('project'),
+                                'known_members', {})
+        try:
+            if known_members.get(int(data)):
+                return User.from_db(None, [User._meta.pk.attname],
+                                    [int(data)])
+        except (TypeError, ValueError):
+            pass
+        return super().to_internal_value(data)
+
+
 class IssueSerializer(serializers.ModelSerializer):
     """ Serializer for issue model """
     author = serializers.PrimaryKeyRelatedField(read_only=True)
+    assigned_to = ContributorField(queryset=User.objects.all(),
+                                   allow_null=True, required=False)
+    archived = serializers.BooleanField(read_only=True)
 
     class Meta:
         model = Issue
@@ -40,7 +81,9 @@ class IssueSerializer(serializers.ModelSerializer):
             'type',
             'status',
             'created_time',
-            'comments'
+            'comments',
+            'version',
+            'archived',
         ]
         read_only_fields = ['author', 'created_time', 'project']
 
@@ -66,8 +109,12 @@ class IssueSerializer(serializers.ModelSerializer):
                 "Project not found to validate the assignment"
             )
 
-        if assigned_to and not project.contributors.filter(
-                pk=assigned_to.pk).exists():
+        is_contributor = getattr(project, 'known_members', {}).get(
+            assigned_to.pk)
+        if is_contributor is None:
+            is_contributor = project.contributors.filter(
+                pk=assigned_to.pk).exists()
+        if not is_contributor:
             raise serializers.ValidationError(
                 {"assigned_to": "The assignee user must be a project "
                                 "contributor"}
@@ -76,10 +123,33 @@ class IssueSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class IssueBatchSerializer(serializers.Serializer):
+    """ Serializer for the ids of a batch of issues """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        min_length=1,
+        max_length=settings.REST_FRAMEWORK['MAX_PAGE_SIZE'])
+
+
+class IssueBoardColumnSerializer(serializers.Serializer):
+    """ Page of a status column of the issue board """
+    count = serializers.IntegerField(allow_null=True)
+    next = serializers.URLField(allow_null=True)
+    results = IssueSerializer(many=True)
+
+
+class IssueBoardSerializer(serializers.Serializer):
+    """ Response of the issue board, one page per status column """
+    todo = IssueBoardColumnSerializer()
+    progress = IssueBoardColumnSerializer()
+    finished = IssueBoardColumnSerializer()
+
+
 class CommentSerializer(serializers.ModelSerializer):
     """ Serializer for issue model """
     author = serializers.PrimaryKeyRelatedField(read_only=True)
     issue = serializers.PrimaryKeyRelatedField(read_only=True)
+    archived = serializers.BooleanField(read_only=True)
 
     class Meta:
         model = Comment
@@ -89,4 +159,6 @@ class CommentSerializer(serializers.ModelSerializer):
             'author',
             'description',
             'created_time',
+            'version',
+            'archived',
         ]
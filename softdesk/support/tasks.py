@@ -0,0 +1,10 @@
+from jobs.registry import register
+
+from .purge import PURGE_BATCH_SIZE, purge_project
+
+
+@register('support.purge_project')
+def purge_project_task(job):
+    """ Purge the rows of a soft deleted project """
+    yield from purge_project(job.payload['project_id'],
+                             job.payload.get('batch_size', PURGE_BATCH_SIZE))
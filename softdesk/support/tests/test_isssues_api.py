@@ -1,9 +1,12 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
 
-from support.models import Project, Issue
+from support.models import Project, Issue, Comment
+from support.serializers import IssueSerializer
 
 User = get_user_model()
 
@@ -79,6 +82,77 @@ class IssueApiTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
         self.assertEqual(Issue.objects.count(), 1)
 
+    def test_create_issue_query_budget(self):
+        self.client.force_authenticate(user=self.author)
+        url = reverse('project-issue-list',
+                      kwargs={'project_id': self.project.pk})
+        payload = {
+            'name': 'New Issue',
+            'description': 'New Description',
+            'priority': 'high',
+            'type': 'feature',
+            'assigned_to': self.user1.pk,
+            'comments': [],
+        }
+        # the project with both memberships, the insert, then the comments
+        # of the response
+        with self.assertNumQueries(3):
+            response = self.client.post(url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['assigned_to'], self.user1.pk)
+        self.assertEqual(response.data['comments'], [])
+        self.assertEqual(Issue.objects.get(pk=response.data['id'])
+                         .assigned_to, self.user1)
+
+    def test_known_assignee_reads_its_fields(self):
+        self.project.known_members = {self.user1.pk: True}
+        serializer = IssueSerializer(
+            data={'name': 'New Issue', 'description': 'New Description',
+                  'priority': 'high', 'type': 'feature',
+                  'assigned_to': self.user1.pk, 'comments': []},
+            context={'project': self.project})
+        with self.assertNumQueries(0):
+            self.assertTrue(serializer.is_valid())
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                serializer.validated_data['assigned_to'].username, 'user1')
+
+    def test_create_issue_with_comments(self):
+        comment = Comment.objects.create(author=self.author, issue=self.issue,
+                                         description='Comment')
+        self.client.force_authenticate(user=self.author)
+        url = reverse('project-issue-list',
+                      kwargs={'project_id': self.project.pk})
+        payload = {
+            'name': 'New Issue',
+            'description': 'New Description',
+            'priority': 'high',
+            'type': 'feature',
+            'comments': [comment.pk],
+        }
+        response = self.client.post(url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['comments'], [comment.pk])
+
+    def test_create_issue_assigned_to_non_contributor(self):
+        self.client.force_authenticate(user=self.author)
+        url = reverse('project-issue-list',
+                      kwargs={'project_id': self.project.pk})
+        for assignee in (self.user2.pk, 999999):
+            payload = {
+                'name': 'New Issue',
+                'description': 'New Description',
+                'priority': 'high',
+                'type': 'feature',
+                'assigned_to': assignee,
+                'comments': [],
+            }
+            response = self.client.post(url, payload, format='json')
+            self.assertEqual(response.status_code,
+                             status.HTTP_400_BAD_REQUEST)
+            self.assertIn('assigned_to', response.data)
+        self.assertEqual(Issue.objects.count(), 1)
+
     def test_update_issue(self):
         self.client.force_authenticate(user=self.author)
         url = reverse('project-issue-detail',
@@ -109,6 +183,25 @@ class IssueApiTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['priority'], 'high')
 
+    def test_patch_issue_status_writes_status_only(self):
+        self.client.force_authenticate(user=self.author)
+        url = reverse('project-issue-detail',
+                      kwargs={'project_id': self.project.pk,
+                              'pk': self.issue.pk})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(url, {'status': 'finished'},
+                                         format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updates = [query['sql'] for query in queries.captured_queries
+                   if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        columns = updates[0].split(' SET ')[1].split(' WHERE ')[0]
+        self.assertIn('"status"', columns)
+        self.assertNotIn('"description"', columns)
+        self.assertNotIn('"name"', columns)
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.status, 'finished')
+
     def test_delete_issue(self):
         self.client.force_authenticate(user=self.author)
         issue_detail_url = reverse(
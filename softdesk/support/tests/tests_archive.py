@@ -0,0 +1,196 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..archive import ChainedQuerySets, archive_issues
+from ..models import Project, Issue, Comment, ArchivedIssue, \
+    ArchivedComment
+from ..purge import purge_project
+
+User = get_user_model()
+
+
+class IssueArchiveTest(APITestCase):
+    """ Tests for the archive of old finished issues """
+    def setUp(self):
+        self.author = User.objects.create(username="author", age=40)
+        self.other = User.objects.create(username="other", age=30)
+        self.project = Project.objects.create(
+            author=self.author,
+            name="project1",
+            description="description1",
+            type="backend")
+        self.project.contributors.add(self.author)
+        self.old = timezone.now() - timedelta(days=400)
+        self.before = timezone.now() - timedelta(days=180)
+
+        self.finished = [self.create_issue('finished', self.old)
+                         for _ in range(2)]
+        self.open = self.create_issue('todo', self.old)
+        self.recent = self.create_issue('finished', timezone.now())
+        self.commented = self.create_issue('finished', self.old)
+        for issue in self.finished:
+            for _ in range(2):
+                comment = Comment.objects.create(
+                    author=self.author, issue=issue,
+                    description='Old comment')
+                Comment.objects.filter(pk=comment.pk).update(
+                    created_time=self.old)
+        Comment.objects.create(author=self.author, issue=self.commented,
+                               description='Recent comment')
+        self.client.force_authenticate(user=self.author)
+
+    def create_issue(self, issue_status, created_time):
+        issue = Issue.objects.create(
+            author=self.author,
+            name='Issue',
+            description='New Description',
+            priority='low',
+            type='bug',
+            status=issue_status,
+            project=self.project,
+        )
+        Issue.objects.filter(pk=issue.pk).update(created_time=created_time)
+        return issue
+
+    def issue_list_url(self):
+        return reverse('project-issue-list',
+                       kwargs={'project_id': self.project.pk})
+
+    def issue_detail_url(self, issue):
+        return reverse('project-issue-detail',
+                       kwargs={'project_id': self.project.pk,
+                               'pk': issue.pk})
+
+    def test_archive_old_finished_issues(self):
+        steps = list(archive_issues(self.before))
+
+        self.assertEqual(steps[-1], {'issues': 2, 'comments': 4,
+                                     'done': True})
+        self.assertEqual(
+            set(ArchivedIssue.objects.values_list('id', flat=True)),
+            {issue.pk for issue in self.finished})
+        self.assertEqual(
+            set(Issue.objects.values_list('id', flat=True)),
+            {self.open.pk, self.recent.pk, self.commented.pk})
+        self.assertEqual(ArchivedComment.objects.count(), 4)
+        self.assertEqual(Comment.objects.count(), 1)
+        archived = ArchivedIssue.objects.get(pk=self.finished[0].pk)
+        self.assertEqual(archived.created_time, self.old)
+        self.assertEqual(archived.version, 1)
+
+    def test_archive_in_batches(self):
+        steps = list(archive_issues(self.before, batch_size=1))
+
+        self.assertEqual([step['issues'] for step in steps], [1, 2, 2])
+        self.assertTrue(steps[-1]['done'])
+
+    def test_archive_command(self):
+        call_command('archive_issues', days=180, stdout=StringIO())
+        self.assertEqual(ArchivedIssue.objects.count(), 2)
+
+    def test_list_issues_include_archived(self):
+        list(archive_issues(self.before))
+
+        response = self.client.get(self.issue_list_url())
+        self.assertEqual(response.data['count'], 3)
+
+        response = self.client.get(self.issue_list_url(),
+                                   {'include_archived': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual(
+            [issue['archived'] for issue in response.data['results']],
+            [False, False, False, True, True])
+        self.assertEqual(len(response.data['results'][3]['comments']), 2)
+
+    def test_list_page_across_tables(self):
+        list(archive_issues(self.before))
+
+        response = self.client.get(self.issue_list_url(),
+                                   {'include_archived': 'true',
+                                    'page_size': 2, 'page': 2})
+        self.assertEqual(
+            [issue['id'] for issue in response.data['results']],
+            [self.commented.pk, self.finished[0].pk])
+
+    def test_retrieve_archived_issue(self):
+        list(archive_issues(self.before))
+        url = self.issue_detail_url(self.finished[0])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(url, {'include_archived': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['archived'])
+
+    def test_archived_issue_is_read_only(self):
+        list(archive_issues(self.before))
+        url = self.issue_detail_url(self.finished[0])
+
+        response = self.client.patch(f'{url}?include_archived=true',
+                                     {'status': 'todo'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_archived_issue_hidden_from_non_contributor(self):
+        list(archive_issues(self.before))
+        self.client.force_authenticate(user=self.other)
+
+        response = self.client.get(self.issue_detail_url(self.finished[0]),
+                                   {'include_archived': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_comments_of_archived_issue(self):
+        list(archive_issues(self.before))
+        url = reverse('project-issue-comment-list',
+                      kwargs={'project_id': self.project.pk,
+                              'issue_id': self.finished[0].pk})
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['results'], [])
+
+        response = self.client.get(url, {'include_archived': 'true'})
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertTrue(response.data['results'][0]['archived'])
+
+    def test_purge_project_deletes_archive(self):
+        list(archive_issues(self.before))
+        self.project.soft_delete()
+        list(purge_project(self.project.pk))
+
+        self.assertFalse(ArchivedIssue.objects.exists())
+        self.assertFalse(ArchivedComment.objects.exists())
+
+
+class ChainedQuerySetsTest(APITestCase):
+    """ Tests for slicing several querysets as one sequence """
+    def setUp(self):
+        self.users = [User.objects.create(username=f"user{index}", age=30)
+                      for index in range(5)]
+        self.first = User.objects.filter(
+            pk__in=[user.pk for user in self.users[:3]]).order_by('pk')
+        self.second = User.objects.filter(
+            pk__in=[user.pk for user in self.users[3:]]).order_by('pk')
+
+    def test_slices(self):
+        chain = ChainedQuerySets(self.first, self.second)
+
+        self.assertEqual(chain.count(), 5)
+        self.assertEqual(chain[:], self.users)
+        self.assertEqual(chain[2:4], self.users[2:4])
+        self.assertEqual(chain[4:10], self.users[4:])
+        self.assertEqual(chain[1], self.users[1])
+        self.assertEqual(chain[5:6], [])
+
+    def test_slice_of_first_queryset_does_not_read_second(self):
+        chain = ChainedQuerySets(self.first, self.second)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(chain[0:3], self.users[:3])
@@ -0,0 +1,63 @@
+import uuid
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from ..ids import Uuid7Generator, uuid7
+from ..models import Project, Issue, Comment
+
+User = get_user_model()
+
+
+class Uuid7Test(SimpleTestCase):
+    """ Tests for the time ordered UUID generator """
+
+    def test_version_and_variant(self):
+        value = uuid7()
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+
+    def test_ids_are_increasing(self):
+        values = [uuid7() for _ in range(10000)]
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(len(set(values)), len(values))
+        self.assertEqual([value.hex for value in values],
+                         sorted(value.hex for value in values))
+
+    def test_timestamp_is_encoded(self):
+        value = Uuid7Generator()(timestamp_ms=1_700_000_000_123)
+        self.assertEqual(value.int >> 80, 1_700_000_000_123)
+
+
+class CommentIdTest(TestCase):
+    """ Tests for comment primary keys """
+    def setUp(self):
+        self.author = User.objects.create(username="author", age=40)
+        self.project = Project.objects.create(
+            name='Test Project', description='A test project',
+            type='backend', author=self.author)
+        self.issue = Issue.objects.create(
+            author=self.author, name='Issue 1', description='Description',
+            priority='low', type='feature', project=self.project)
+
+    def test_new_comment_has_time_ordered_id(self):
+        comment = Comment.objects.create(author=self.author,
+                                         issue=self.issue,
+                                         description="comment")
+        self.assertEqual(comment.pk.version, 7)
+
+    def test_rekey_existing_comments(self):
+        old = [Comment.objects.create(id=uuid.uuid4(), author=self.author,
+                                      issue=self.issue,
+                                      description=f"comment {index}")
+               for index in range(3)]
+        call_command('rekey_comments', batch_size=2, stdout=StringIO())
+
+        comments = list(Comment.objects.all())
+        self.assertEqual([c.description for c in comments],
+                         [c.description for c in old])
+        self.assertTrue(all(c.pk.version == 7 for c in comments))
+        self.assertEqual([c.pk for c in comments],
+                         sorted(c.pk for c in comments))
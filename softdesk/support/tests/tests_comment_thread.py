@@ -0,0 +1,114 @@
+from base64 import urlsafe_b64encode
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from ..models import Project, Issue, Comment
+
+User = get_user_model()
+
+
+class CommentThreadApiTest(APITestCase):
+    """ Tests for comment threads served in time order """
+    def setUp(self):
+        self.author = User.objects.create(username="author", age=40)
+        self.project = Project.objects.create(
+            name='Test Project',
+            description='A test project',
+            type='backend',
+            author=self.author,
+        )
+        self.project.contributors.add(self.author)
+        self.issue = Issue.objects.create(
+            author=self.author,
+            name='Issue 1',
+            description='New Description',
+            priority='low',
+            type='feature',
+            project=self.project,
+        )
+        start = timezone.now() - timedelta(hours=1)
+        self.comments = []
+        for index in range(12):
+            comment = Comment.objects.create(author=self.author,
+                                             issue=self.issue,
+                                             description=f"comment {index}")
+            Comment.objects.filter(pk=comment.pk).update(
+                created_time=start + timedelta(minutes=index))
+            self.comments.append(comment)
+        self.url = reverse('project-issue-comment-list',
+                           kwargs={'project_id': self.project.pk,
+                                   'issue_id': self.issue.pk})
+        self.client.force_authenticate(user=self.author)
+
+    @staticmethod
+    def descriptions(response):
+        return [c["description"] for c in response.data["results"]]
+
+    def test_thread_opens_on_latest_comments(self):
+        response = self.client.get(self.url)
+        self.assertEqual(self.descriptions(response),
+                         [f"comment {index}" for index in range(7, 12)])
+        self.assertIsNotNone(response.data["older"])
+
+    def test_load_older_then_newer(self):
+        latest = self.client.get(self.url)
+        older = self.client.get(latest.data["older"])
+        self.assertEqual(self.descriptions(older),
+                         [f"comment {index}" for index in range(2, 7)])
+
+        oldest = self.client.get(older.data["older"])
+        self.assertEqual(self.descriptions(oldest),
+                         ["comment 0", "comment 1"])
+        self.assertIsNone(oldest.data["older"])
+
+        newer = self.client.get(oldest.data["newer"])
+        self.assertEqual(self.descriptions(newer),
+                         [f"comment {index}" for index in range(2, 7)])
+
+    def test_load_newer_returns_new_comments(self):
+        latest = self.client.get(self.url)
+        Comment.objects.create(author=self.author, issue=self.issue,
+                               description="comment 12")
+        newer = self.client.get(latest.data["newer"])
+        self.assertEqual(self.descriptions(newer), ["comment 12"])
+
+    def test_thread_around_anchor_comment(self):
+        response = self.client.get(self.url, {
+            'around': str(self.comments[5].pk)})
+        self.assertEqual(self.descriptions(response),
+                         [f"comment {index}" for index in range(3, 8)])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'before': 'invalid'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_with_invalid_id(self):
+        cursor = urlsafe_b64encode(
+            f'{timezone.now().isoformat()}|abc'.encode()).decode()
+        for param in ('before', 'after'):
+            response = self.client.get(self.url, {param: cursor})
+            self.assertEqual(response.status_code, 404)
+
+    def test_invalid_around(self):
+        response = self.client.get(self.url, {'around': 'xyz'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_latest_page_uses_thread_index(self):
+        queryset = (Comment.objects
+                    .filter(issue__id=self.issue.pk,
+                            issue__project__id=self.project.pk,
+                            issue__project__contributors=self.author,
+                            issue__project__deleted_at__isnull=True)
+                    .select_related('author', 'issue', 'issue__project')
+                    .order_by('-created_time', '-id')[:6])
+        with connection.cursor() as cursor:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn('comment_thread_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import Project, Issue, Comment
+
+User = get_user_model()
+
+
+class VersionedUpdateApiTest(APITestCase):
+    """ Tests for the If-Match conditional updates of issues and comments """
+    def setUp(self):
+        self.author = User.objects.create(username="author", age=40)
+        self.project = Project.objects.create(
+            name='Project 1', description='A test project',
+            type='backend', author=self.author)
+        self.project.contributors.add(self.author)
+        self.issue = Issue.objects.create(
+            author=self.author, name='Issue', description='Description',
+            priority='low', type='bug', project=self.project)
+        self.comment = Comment.objects.create(
+            author=self.author, issue=self.issue, description='Comment')
+        self.issue_url = reverse('project-issue-detail', kwargs={
+            'project_id': self.project.pk, 'pk': self.issue.pk})
+        self.comment_url = reverse('project-issue-comment-detail', kwargs={
+            'project_id': self.project.pk, 'issue_id': self.issue.pk,
+            'pk': self.comment.pk})
+        self.payload = {'name': 'Renamed', 'description': 'Description',
+                        'priority': 'high', 'type': 'bug', 'comments': []}
+        self.client.force_authenticate(user=self.author)
+
+    def test_etag_is_the_version(self):
+        response = self.client.get(self.issue_url)
+        self.assertEqual(response['ETag'], '"1"')
+        self.assertEqual(response.data['version'], 1)
+
+    def test_update_with_matching_version(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put(self.issue_url, self.payload,
+                                       format='json', HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"2"')
+        updates = [query['sql'] for query in queries.captured_queries
+                   if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"version"', updates[0].split('WHERE')[1])
+        self.issue.refresh_from_db()
+        self.assertEqual((self.issue.name, self.issue.priority,
+                          self.issue.version), ('Renamed', 'high', 2))
+
+    def test_update_with_stale_version(self):
+        Issue.objects.filter(pk=self.issue.pk).update(version=2)
+        response = self.client.put(self.issue_url, self.payload,
+                                   format='json', HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code,
+                         status.HTTP_412_PRECONDITION_FAILED)
+        self.issue.refresh_from_db()
+        self.assertEqual((self.issue.name, self.issue.version),
+                         ('Issue', 2))
+
+    def test_update_without_condition_bumps_version(self):
+        response = self.client.put(self.issue_url, self.payload,
+                                   format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['version'], 2)
+
+    def test_comment_update_with_weak_etag(self):
+        response = self.client.put(self.comment_url,
+                                   {'description': 'Edited'},
+                                   format='json', HTTP_IF_MATCH='W/"1"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"2"')
+        response = self.client.put(self.comment_url,
+                                   {'description': 'Lost update'},
+                                   format='json', HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code,
+                         status.HTTP_412_PRECONDITION_FAILED)
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.description, 'Edited')
+
+    def test_invalid_if_match(self):
+        response = self.client.put(self.issue_url, self.payload,
+                                   format='json', HTTP_IF_MATCH='"abc"')
+        self.assertEqual(response.status_code,
+                         status.HTTP_412_PRECONDITION_FAILED)
@@ -76,3 +76,40 @@ class ProjectContributorsApiTest(APITestCase):
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertNotIn(self.contributor2, self.project.contributors.all())
+
+    def test_list_contributors_single_query(self):
+        self.project.contributors.add(self.contributor2)
+        self.client.force_authenticate(user=self.contributor1)
+        url = reverse('project-contributor-list',
+                      kwargs={'project_id': self.project.pk})
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual([user['username'] for user in
+                          response.data['results']],
+                         ['contributor1', 'contributor2'])
+        self.assertNotIn('password', response.data['results'][0])
+        self.assertIsNotNone(response.data['next'])
+
+    def test_search_contributors_by_username_prefix(self):
+        self.project.contributors.add(self.contributor2)
+        self.client.force_authenticate(user=self.author)
+        url = reverse('project-contributor-list',
+                      kwargs={'project_id': self.project.pk})
+        response = self.client.get(url, {'search': 'contrib'})
+        self.assertEqual([user['username'] for user in
+                          response.data['results']],
+                         ['contributor1', 'contributor2'])
+        response = self.client.get(url, {'search': 'contributor2'})
+        self.assertEqual(response.data['count'], 1)
+        response = self.client.get(url, {'search': 'nobody'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 0)
+
+    def test_list_contributors_hidden_to_non_contributors(self):
+        self.client.force_authenticate(user=self.user1)
+        url = reverse('project-contributor-list',
+                      kwargs={'project_id': self.project.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import Project, Issue, Comment, IdempotencyKey
+
+User = get_user_model()
+
+
+class IdempotencyKeyApiTest(APITestCase):
+    """ Tests for POST requests retried with an Idempotency-Key header """
+    def setUp(self):
+        self.author = User.objects.create(username="author", age=40)
+        self.user1 = User.objects.create(username="user1", age=23)
+        self.project = Project.objects.create(
+            name='Test Project',
+            description='A test project',
+            type='backend',
+            author=self.author,
+        )
+        self.project.contributors.add(self.author, self.user1)
+        self.issue = Issue.objects.create(
+            author=self.author,
+            name='Issue 1',
+            description='New Description',
+            priority='low',
+            type='feature',
+            project=self.project,
+        )
+        self.comments_url = reverse(
+            'project-issue-comment-list',
+            kwargs={'project_id': self.project.pk, 'issue_id': self.issue.pk})
+        self.client.force_authenticate(user=self.author)
+
+    def post_comment(self, description, key="key-1"):
+        return self.client.post(self.comments_url,
+                                {'description': description},
+                                format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_returns_original_response(self):
+        first = self.post_comment("New comment")
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        with self.assertNumQueries(1):
+            retry = self.post_comment("New comment")
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(Comment.objects.count(), 1)
+
+    def test_key_reused_with_another_payload(self):
+        self.post_comment("New comment")
+        response = self.post_comment("Another comment")
+        self.assertEqual(response.status_code,
+                         status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Comment.objects.count(), 1)
+
+    def test_keys_are_scoped_per_user(self):
+        self.post_comment("New comment")
+        self.client.force_authenticate(user=self.user1)
+        response = self.post_comment("New comment")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Comment.objects.count(), 2)
+
+    def test_failed_request_is_not_stored(self):
+        response = self.post_comment("")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        response = self.post_comment("Fixed comment")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_expired_key_runs_again(self):
+        self.post_comment("New comment")
+        IdempotencyKey.objects.update(
+            expires_at=timezone.now() - timedelta(seconds=1))
+        response = self.post_comment("New comment")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Comment.objects.count(), 2)
+
+    def test_abandoned_request_runs_again_after_lease(self):
+        self.post_comment("New comment")
+        # The worker running the first request crashed before storing it
+        IdempotencyKey.objects.update(
+            status_code=None, response=None,
+            expires_at=timezone.now() + timedelta(seconds=30))
+        response = self.post_comment("New comment")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        IdempotencyKey.objects.update(
+            expires_at=timezone.now() - timedelta(seconds=1))
+        response = self.post_comment("New comment")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertGreater(IdempotencyKey.objects.get().expires_at,
+                           timezone.now() + timedelta(hours=1))
+
+    def test_user_signup_is_idempotent(self):
+        self.client.force_authenticate(user=None)
+        payload = {
+            "username": "new-user",
+            "first_name": "New",
+            "last_name": "User",
+            "age": 20,
+            "can_be_contacted": False,
+            "can_data_be_shared": False,
+        }
+        for _ in range(2):
+            response = self.client.post(reverse('user-list'), payload,
+                                        format='json',
+                                        HTTP_IDEMPOTENCY_KEY="signup")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(User.objects.filter(username="new-user").count(),
+                         1)
@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import Project, Issue
+
+User = get_user_model()
+
+
+class IssueBatchApiTest(APITestCase):
+    """ Tests for fetching several issues at once """
+    def setUp(self):
+        self.url = reverse('issue-batch')
+        self.author = User.objects.create(username="author", age=40)
+        self.user2 = User.objects.create(username="user2", age=33)
+        self.project1 = Project.objects.create(
+            name='Project 1', description='A test project',
+            type='backend', author=self.author)
+        self.project2 = Project.objects.create(
+            name='Project 2', description='A test project',
+            type='backend', author=self.author)
+        self.other_project = Project.objects.create(
+            name='Other', description='A test project',
+            type='backend', author=self.user2)
+        self.project1.contributors.add(self.author)
+        self.project2.contributors.add(self.author)
+        self.other_project.contributors.add(self.user2)
+        self.issues = [
+            Issue.objects.create(author=self.author, name=f'Issue {index}',
+                                 description='Description', priority='low',
+                                 type='bug', project=project)
+            for index, project in enumerate(
+                [self.project1, self.project2, self.other_project])
+        ]
+        self.client.force_authenticate(user=self.author)
+
+    def test_get_batch_across_projects(self):
+        ids = [self.issues[1].pk, self.issues[0].pk]
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                self.url, {'ids': ','.join(map(str, ids))})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([issue["id"] for issue in response.data["results"]],
+                         ids)
+        self.assertEqual(response.data["missing"], [])
+
+    def test_post_batch_hides_other_projects(self):
+        ids = [self.issues[0].pk, self.issues[2].pk, 999999]
+        response = self.client.post(self.url, {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([issue["id"] for issue in response.data["results"]],
+                         [self.issues[0].pk])
+        self.assertEqual(response.data["missing"],
+                         [self.issues[2].pk, 999999])
+
+    def test_batch_size_is_limited(self):
+        response = self.client.post(self.url, {'ids': list(range(1, 200))},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_ids(self):
+        response = self.client.get(self.url, {'ids': '1,abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
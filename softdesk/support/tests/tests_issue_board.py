@@ -0,0 +1,86 @@
+from base64 import urlsafe_b64encode
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ..models import Project, Issue
+
+User = get_user_model()
+
+
+class IssueBoardApiTest(APITestCase):
+    """ Tests for the issue board grouped by status """
+    def setUp(self):
+        self.author = User.objects.create(username="author", age=40)
+        self.outsider = User.objects.create(username="outsider", age=33)
+        self.project = Project.objects.create(
+            name='Project 1', description='A test project',
+            type='backend', author=self.author)
+        self.project.contributors.add(self.author)
+        self.url = reverse('project-issue-board',
+                           kwargs={'project_id': self.project.pk})
+        self.todo = [self.create_issue('todo', index) for index in range(7)]
+        self.finished = [self.create_issue('finished', index)
+                         for index in range(2)]
+        self.client.force_authenticate(user=self.author)
+
+    def create_issue(self, issue_status, index):
+        return Issue.objects.create(
+            author=self.author, name=f'Issue {issue_status} {index}',
+            description='Description', priority='low', type='bug',
+            status=issue_status, project=self.project)
+
+    def ids(self, column):
+        return [issue['id'] for issue in column['results']]
+
+    def test_board_first_pages(self):
+        # windowed issues, prefetched comments
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {'page_size': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data), ['todo', 'progress',
+                                               'finished'])
+        todo = response.data['todo']
+        self.assertEqual(todo['count'], 7)
+        self.assertEqual(self.ids(todo),
+                         [issue.pk for issue in self.todo[:-4:-1]])
+        self.assertIsNotNone(todo['next'])
+        self.assertEqual(response.data['progress'],
+                         {'count': 0, 'next': None, 'results': []})
+        self.assertEqual(response.data['finished']['count'], 2)
+        self.assertIsNone(response.data['finished']['next'])
+
+    def test_column_pages_by_cursor(self):
+        response = self.client.get(self.url, {'page_size': 3})
+        seen = self.ids(response.data['todo'])
+        next_link = response.data['todo']['next']
+        while next_link:
+            response = self.client.get(next_link)
+            self.assertEqual(list(response.data), ['todo'])
+            self.assertIsNone(response.data['todo']['count'])
+            seen += self.ids(response.data['todo'])
+            next_link = response.data['todo']['next']
+        self.assertEqual(seen, [issue.pk for issue in reversed(self.todo)])
+
+    def test_invalid_parameters(self):
+        response = self.client.get(self.url, {'status': 'blocked'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'cursor': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'status': 'todo',
+                                              'cursor': '!!'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_invalid_id(self):
+        cursor = urlsafe_b64encode(b'2024-01-01T00:00:00|abc').decode()
+        response = self.client.get(self.url, {'status': 'todo',
+                                              'cursor': cursor})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_board_hidden_to_outsiders(self):
+        self.client.force_authenticate(user=self.outsider)
+        response = self.client.get(self.url)
+        self.assertTrue(all(column['count'] == 0
+                            for column in response.data.values()))
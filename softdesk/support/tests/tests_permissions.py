@@ -0,0 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from ..models import Project, Issue, Comment
+from ..permissions import IsAuthorOrContributor, ProjectAccess
+
+User = get_user_model()
+
+
+class ProjectAccessTest(APITestCase):
+    """ Tests for the can read / can edit resolver and its permissions """
+    def setUp(self):
+        self.author = User.objects.create(username="author", age=40)
+        self.contributor = User.objects.create(username="contributor",
+                                               age=33)
+        self.outsider = User.objects.create(username="outsider", age=28)
+        self.project = Project.objects.create(
+            name='Project 1', description='A test project',
+            type='backend', author=self.author)
+        self.project.contributors.add(self.author, self.contributor)
+        self.issue = Issue.objects.create(
+            author=self.author, name='Issue', description='Description',
+            priority='low', type='bug', project=self.project)
+        self.comment = Comment.objects.create(
+            author=self.contributor, issue=self.issue,
+            description='Comment')
+
+    def objects(self):
+        """ The objects as loaded by the viewsets, without relations """
+        return [Project.objects.get(pk=self.project.pk),
+                Issue.objects.get(pk=self.issue.pk),
+                Comment.objects.select_related('issue').get(
+                    pk=self.comment.pk)]
+
+    def allowed(self, user, method, objects):
+        request = getattr(APIRequestFactory(), method)('/')
+        request.user = user
+        permission = IsAuthorOrContributor()
+        return [permission.has_object_permission(request, None, obj)
+                for obj in objects]
+
+    def test_checks_without_queries(self):
+        objects = self.objects()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.allowed(self.author, 'get', objects),
+                             [True, True, True])
+            self.assertEqual(self.allowed(self.author, 'put', objects),
+                             [True, True, False])
+            self.assertEqual(self.allowed(self.contributor, 'put', objects),
+                             [False, False, True])
+
+    def test_lookup_per_project(self):
+        other = Project.objects.create(
+            name='Project 2', description='Another project',
+            type='backend', author=self.contributor)
+        other.contributors.add(self.author, self.contributor)
+        access = ProjectAccess(self.author)
+        with self.assertNumQueries(1):
+            self.assertTrue(access.is_project_author(self.project.pk))
+        with self.assertNumQueries(1):
+            self.assertFalse(access.is_project_author(other.pk))
+            self.assertTrue(access.is_contributor(other.pk))
+
+    def test_comment_detail_queries(self):
+        self.client.force_authenticate(user=self.contributor)
+        url = reverse('project-issue-comment-detail', kwargs={
+            'project_id': self.project.pk, 'issue_id': self.issue.pk,
+            'pk': self.comment.pk})
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_outsider_does_not_see_objects(self):
+        self.assertFalse(ProjectAccess(self.outsider).is_contributor(
+            self.project.pk))
+        self.assertFalse(ProjectAccess(self.contributor).is_project_author(
+            self.project.pk))
+        self.client.force_authenticate(user=self.outsider)
+        url = reverse('project-issue-comment-detail', kwargs={
+            'project_id': self.project.pk, 'issue_id': self.issue.pk,
+            'pk': self.comment.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_contributor_reads_but_cannot_edit(self):
+        self.client.force_authenticate(user=self.contributor)
+        url = reverse('project-issue-detail', kwargs={
+            'project_id': self.project.pk, 'pk': self.issue.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.put(url, {'name': 'Renamed'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_project_author_adds_contributors(self):
+        url = reverse('project-contributor-list', kwargs={
+            'project_id': self.project.pk})
+        self.client.force_authenticate(user=self.contributor)
+        response = self.client.post(url, {'user_id': self.outsider.pk})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=self.author)
+        response = self.client.post(url, {'user_id': self.outsider.pk})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
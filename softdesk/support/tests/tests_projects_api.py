@@ -1,8 +1,10 @@
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 from django.urls import reverse
 from rest_framework import status
-from ..models import Project
+from ..models import Project, Issue
 
 User = get_user_model()
 
@@ -113,13 +115,31 @@ class ProjectsApiTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["name"], "project1-new")
 
+    def test_patch_project_by_author(self):
+        self.auth(self.user1)
+        project1_detail_url = reverse(
+            'project-detail',
+            args=[self.project1.pk])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(project1_detail_url,
+                                         {"name": "project1-new"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["name"], "project1-new")
+        self.assertEqual(response.data["description"], "description1")
+        updates = [query['sql'] for query in queries.captured_queries
+                   if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('"description"', updates[0])
+
     def test_delete_project_by_author(self):
         self.auth(self.user1)
         project2_detail_url = reverse(
             'project-detail',
             args=[self.project2.pk])
         response = self.client.delete(project2_detail_url)
-        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
         self.assertFalse(Project.objects.filter(pk=self.project2.pk).exists())
 
     def test_delete_project_not_contributor_or_return_404(self):
@@ -137,3 +157,49 @@ class ProjectsApiTest(APITestCase):
 
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ProjectSummaryApiTest(APITestCase):
+    """ Tests for the projects embedding their summary """
+    def setUp(self):
+        self.list_url = reverse('project-list')
+        self.user1 = User.objects.create(username="user1", age=25)
+        self.user2 = User.objects.create(username="user2", age=35)
+        self.client.force_authenticate(user=self.user1)
+
+    def create_projects(self, count):
+        for index in range(count):
+            project = Project.objects.create(
+                author=self.user1, name=f"project{index}",
+                description="description", type="backend")
+            project.contributors.add(self.user1, self.user2)
+            for issue_status in ('todo', 'progress', 'finished'):
+                Issue.objects.create(
+                    author=self.user1, name='Issue',
+                    description='Description', priority='low', type='bug',
+                    status=issue_status, project=project)
+
+    def test_summary_fields(self):
+        self.create_projects(1)
+        response = self.client.get(self.list_url, {'embed': 'summary'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        project = response.data['results'][0]
+        self.assertEqual(project['author_username'], 'user1')
+        self.assertEqual(sorted(project['contributor_usernames']),
+                         ['user1', 'user2'])
+        self.assertEqual(project['open_issue_count'], 2)
+
+        response = self.client.get(self.list_url)
+        self.assertNotIn('open_issue_count', response.data['results'][0])
+
+    def test_summary_in_constant_queries(self):
+        self.create_projects(2)
+        # count, projects with their annotations, contributors
+        with self.assertNumQueries(3):
+            self.client.get(self.list_url, {'embed': 'summary'})
+        self.create_projects(8)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.list_url,
+                                       {'embed': 'summary',
+                                        'page_size': 10})
+        self.assertEqual(len(response.data['results']), 10)
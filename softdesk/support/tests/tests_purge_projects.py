@@ -0,0 +1,100 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jobs.models import Job
+from jobs.runner import run_pending
+from ..models import Project, Issue, Comment
+from ..purge import purge_project
+
+User = get_user_model()
+
+
+class ProjectSoftDeleteTest(APITestCase):
+    """ Tests for project soft deletion and background purge """
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username="author",
+            password="pass123",
+            first_name="author",
+            last_name="soft",
+            age=40
+        )
+        self.project = Project.objects.create(
+            author=self.author,
+            name="project1",
+            description="description1",
+            type="backend")
+        self.project.contributors.add(self.author)
+        for index in range(3):
+            issue = Issue.objects.create(
+                author=self.author,
+                name=f'Issue {index}',
+                description='New Description',
+                priority='low',
+                type='feature',
+                project=self.project,
+            )
+            for _ in range(2):
+                Comment.objects.create(author=self.author, issue=issue,
+                                       description='New comment')
+        self.client.force_authenticate(user=self.author)
+
+    def test_delete_project_is_soft(self):
+        url = reverse('project-detail', args=[self.project.pk])
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "pending")
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
+        self.assertTrue(
+            Project.all_objects.filter(pk=self.project.pk).exists())
+        self.assertEqual(Issue.objects.count(), 3)
+
+    def test_delete_project_purge_job(self):
+        url = reverse('project-detail', args=[self.project.pk])
+        job_id = self.client.delete(url).data["id"]
+
+        self.assertEqual(run_pending(), 1)
+        job = Job.objects.get(pk=job_id)
+        self.assertEqual(job.status, "succeeded")
+        self.assertEqual(job.progress["comments"], 6)
+        self.assertFalse(
+            Project.all_objects.filter(pk=self.project.pk).exists())
+
+    def test_delete_project_rolled_back_without_job(self):
+        url = reverse('project-detail', args=[self.project.pk])
+        with mock.patch.object(Job.objects, 'enqueue',
+                               side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.client.delete(url)
+        self.assertTrue(Project.objects.filter(pk=self.project.pk).exists())
+
+    def test_soft_deleted_project_is_hidden(self):
+        self.project.soft_delete()
+        response = self.client.get(reverse('project-list'))
+        self.assertEqual(response.data["results"], [])
+
+        url = reverse('project-issue-list',
+                      kwargs={'project_id': self.project.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_purge_project_in_batches(self):
+        self.project.soft_delete()
+        steps = list(purge_project(self.project.pk, batch_size=2))
+
+        self.assertEqual(len(steps), 6)
+        self.assertEqual(steps[-1]["comments"], 6)
+        self.assertEqual(steps[-1]["issues"], 3)
+        self.assertTrue(steps[-1]["done"])
+        self.assertFalse(
+            Project.all_objects.filter(pk=self.project.pk).exists())
+        self.assertEqual(Comment.objects.count(), 0)
+
+    def test_purge_ignores_alive_project(self):
+        list(purge_project(self.project.pk))
+        self.assertTrue(Project.objects.filter(pk=self.project.pk).exists())
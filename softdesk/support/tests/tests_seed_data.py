@@ -0,0 +1,69 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from ..models import Project, Issue, Comment
+
+User = get_user_model()
+
+
+class SeedDataTest(TestCase):
+    """ Tests for the seed_data command """
+    def seed(self, **options):
+        options = {'users': 20, 'projects': 5, 'issues': 50,
+                   'comments': 300, 'batch_size': 40, **options}
+        call_command('seed_data', stdout=StringIO(), **options)
+
+    @staticmethod
+    def snapshot():
+        return (
+            list(Issue.objects.order_by('id').values_list(
+                'name', 'status', 'priority', 'created_time')),
+            list(Comment.objects.values_list('id', 'created_time')),
+        )
+
+    def test_volumes(self):
+        self.seed()
+
+        self.assertEqual(User.objects.count(), 20)
+        self.assertEqual(Project.objects.count(), 5)
+        self.assertEqual(Issue.objects.count(), 50)
+        self.assertEqual(Comment.objects.count(), 300)
+
+    def test_rows_are_consistent(self):
+        self.seed()
+
+        for issue in Issue.objects.select_related('project'):
+            self.assertGreaterEqual(issue.created_time,
+                                    issue.project.created_time)
+        for comment in Comment.objects.select_related('issue__project'):
+            self.assertGreaterEqual(comment.created_time,
+                                    comment.issue.created_time)
+            self.assertTrue(comment.issue.project.contributors.filter(
+                pk=comment.author_id).exists())
+
+    def test_same_seed_same_rows(self):
+        self.seed()
+        first = self.snapshot()
+        User.objects.all().delete()
+        self.seed()
+
+        self.assertEqual(self.snapshot(), first)
+
+    def test_counts_must_be_positive(self):
+        for name in ('users', 'projects', 'issues', 'comments', 'days',
+                     'batch_size'):
+            with self.subTest(name), self.assertRaises(CommandError):
+                self.seed(**{name: 0})
+        self.assertFalse(User.objects.exists())
+
+    def test_second_run_needs_another_prefix(self):
+        self.seed()
+        with self.assertRaises(CommandError):
+            self.seed()
+
+        self.seed(prefix='other')
+        self.assertEqual(Comment.objects.count(), 600)
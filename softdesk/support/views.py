@@ -1,96 +1,177 @@
 from django.contrib.auth import get_user_model
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from drf_spectacular.utils import extend_schema_view, extend_schema
-from rest_framework import permissions, status
+from drf_spectacular.utils import extend_schema_view, extend_schema, \
+    OpenApiParameter, OpenApiResponse, inline_serializer
+from rest_framework import serializers, status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.exceptions import NotFound, PermissionDenied
-from django.db.models import Prefetch
-
-from authentication.serializers import CustomUserSerializer
-from .models import Project, Issue, Comment
-from .serializers import ProjectSerializer, IssueSerializer, CommentSerializer
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Prefetch, Q
+
+from authentication.serializers import CustomUserSerializer, \
+    CustomUserReadSerializer
+from jobs.models import Job
+from jobs.serializers import JobSerializer
+from softdesk.pagination import WindowCountPagination
+from .archive import INCLUDE_ARCHIVED_PARAM, ChainedQuerySets, \
+    include_archived
+from .concurrency import VersionedUpdateMixin
+from .idempotency import IdempotentPostMixin
+from .models import Project, Issue, Comment, ArchivedIssue, \
+    ArchivedComment
+from .pagination import CommentThreadPagination, IssueBoardPagination
+from .permissions import IsAuthorOrContributor, IsProjectAuthor, \
+    ProjectAccess
+from .serializers import ProjectSerializer, ProjectSummarySerializer, \
+    IssueSerializer, IssueBatchSerializer, IssueBoardSerializer, \
+    CommentSerializer
 
 User = get_user_model()
 
+IF_MATCH_PARAMETER = OpenApiParameter(
+    'If-Match', str, OpenApiParameter.HEADER,
+    description="ETag of the version read, the update is refused with 412 "
+                "when it is no longer the current one")
+VERSION_CONFLICT_RESPONSE = OpenApiResponse(
+    description="Modified since the version of If-Match")
+PROJECT_EMBED_PARAMETER = OpenApiParameter(
+    'embed', str, enum=['summary'],
+    description="summary adds the author and contributor usernames and the "
+                "open issue count of each project")
+INCLUDE_ARCHIVED_PARAMETER = OpenApiParameter(
+    INCLUDE_ARCHIVED_PARAM, bool,
+    description="true also reads the archived issues and comments, old "
+                "finished issues moved out of the live tables")
 
-class IsAuthorOrContributor(permissions.BasePermission):
-    """Allows access only to authors"""
-    def has_object_permission(self, request, view, obj):
-        return obj.author == request.user
-
-
-class IsProjectAuthor(permissions.BasePermission):
-    """Allows access only to project authors"""
-    def has_permission(self, request, view):
-        project_id = view.kwargs.get('project_id')
-        if not project_id:
-            return False
-        return Project.objects.filter(id=project_id,
-                                      author=request.user).exists()
 
 @extend_schema_view(
-    list=extend_schema(summary="Projects list",tags=["Project"]),
+    list=extend_schema(summary="Projects list",tags=["Project"],
+                       parameters=[PROJECT_EMBED_PARAMETER]),
     create=extend_schema(summary="Create a project", tags=["Project"]),
-    retrieve=extend_schema(summary="Get project details", tags=["Project"]),
+    retrieve=extend_schema(summary="Get project details", tags=["Project"],
+                           parameters=[PROJECT_EMBED_PARAMETER]),
     update=extend_schema(summary="Update a project", tags=["Project"]),
-    destroy=extend_schema(summary="Delete a project", tags=["Project"]),
+    partial_update=extend_schema(summary="Partially update a project",
+                                 tags=["Project"]),
+    destroy=extend_schema(summary="Delete a project", tags=["Project"],
+                          responses={202: JobSerializer}),
 )
-class ProjectViewSet(ModelViewSet):
+class ProjectViewSet(IdempotentPostMixin, ModelViewSet):
     """ ViewSet for viewing and editing project """
-    http_method_names = ['get', 'post', 'put', 'delete']
+    http_method_names = ['get', 'post', 'put', 'patch', 'delete']
     serializer_class = ProjectSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsAuthorOrContributor]
+
+    def embeds_summary(self):
+        return (self.action in ['list', 'retrieve']
+                and self.request.query_params.get('embed') == 'summary')
+
+    def get_serializer_class(self):
+        if self.embeds_summary():
+            return ProjectSummarySerializer
+        return super().get_serializer_class()
 
     def get_queryset(self):
-        return (
+        """ Projects of the user, with the summary annotations when asked:
+            the page costs the same queries whatever its size """
+        contributor_fields = ("id", "username") if self.embeds_summary() \
+            else ("id",)
+        queryset = (
             Project.objects
             .filter(contributors=self.request.user)
             .select_related("author")
-            .prefetch_related(Prefetch("contributors",
-                                       queryset=User.objects.only("id")))
+            .prefetch_related(Prefetch(
+                "contributors",
+                queryset=User.objects.only(*contributor_fields)))
         )
-
-    def get_permissions(self):
-        """ Return permissions based on action """
-        if self.action in ['update', 'partial_update', 'destroy']:
-            permission_classes = [IsAuthenticated, IsAuthorOrContributor]
-        else:
-            permission_classes = [IsAuthenticated]
-        return [permission() for permission in permission_classes]
+        if self.embeds_summary():
+            queryset = queryset.annotate(open_issue_count=Count(
+                "issues", filter=~Q(issues__status="finished"),
+                distinct=True))
+        return queryset
 
     def perform_create(self, serializer):
         """ Create a new project with author as automatically a contributor"""
         project = serializer.save(author=self.request.user)
         project.contributors.add(self.request.user)
 
+    def destroy(self, request, *args, **kwargs):
+        """ Soft delete the project and return the purge job """
+        job = self.perform_destroy(self.get_object())
+        return Response(JobSerializer(job).data,
+                        status=status.HTTP_202_ACCEPTED)
+
+    def perform_destroy(self, instance):
+        """ Soft delete the project, rows are purged in background.
+            Both happen in one transaction, so a hidden project always has
+            its purge job. """
+        with transaction.atomic():
+            instance.soft_delete()
+            return Job.objects.enqueue('support.purge_project',
+                                       owner=self.request.user,
+                                       project_id=instance.pk)
+
 
 @extend_schema_view(
-    list=extend_schema(summary="Contributors list", tags=["Contributors"]),
+    list=extend_schema(summary="Contributors list", tags=["Contributors"],
+                       parameters=[OpenApiParameter(
+                           'search', str,
+                           description="Username prefix")]),
     create=extend_schema(summary="Add a contributor to a project", tags=[
         "Contributors"]),
     retrieve=extend_schema(summary="Get contributor details",
                            tags=["Contributors"]),
     destroy=extend_schema(tags=["Contributors"]),
 )
-class ProjectContributorViewSet(ModelViewSet):
+class ProjectContributorViewSet(IdempotentPostMixin, ModelViewSet):
     """ ViewSet for viewing and editing project contributors """
     http_method_names = ['get', 'post', 'delete']
     serializer_class = CustomUserSerializer
+    pagination_class = WindowCountPagination
     lookup_field = "pk"
     lookup_value_regex = r"\d+"
 
-    def get_project(self):
-        return get_object_or_404(
-            Project.objects.filter(contributors=self.request.user),
-            id=self.kwargs["project_id"]
-        )
+    def get_serializer_class(self):
+        if self.action in ['list', 'retrieve']:
+            return CustomUserReadSerializer
+        return super().get_serializer_class()
 
     def get_queryset(self):
-        """ Restrict the queryset based on project contributors """
-        project = self.get_project()
-        return project.contributors.all()
+        """ Contributors of the project, visible to its contributors only.
+            The membership of the caller is checked in the same query, and
+            ?search=<prefix> filters the usernames by an index range.
+        """
+        project_id = self.kwargs["project_id"]
+        queryset = (
+            User.objects
+            .filter(projects__id=project_id,
+                    projects__deleted_at__isnull=True)
+            .filter(Exists(Project.contributors.through.objects.filter(
+                project_id=project_id, customuser_id=self.request.user.pk)))
+            .only(*CustomUserReadSerializer.Meta.fields)
+            .order_by("username")
+        )
+        prefix = self.request.query_params.get("search")
+        if prefix:
+            queryset = queryset.filter(
+                username__gte=prefix,
+                username__lt=prefix[:-1] + chr(ord(prefix[-1]) + 1))
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        """ An empty page is checked against the membership of the caller,
+            to answer 404 for a missing or hidden project """
+        response = super().list(request, *args, **kwargs)
+        if (not response.data["results"]
+                and not ProjectAccess.for_request(request).is_contributor(
+                    kwargs["project_id"])):
+            raise NotFound()
+        return response
 
     def get_permissions(self):
         """ Return permissions based on action """
@@ -121,98 +202,261 @@ class ProjectContributorViewSet(ModelViewSet):
 
 
 @extend_schema_view(
-    list=extend_schema(summary="Issues list", tags=["Issues"]),
+    list=extend_schema(summary="Issues list", tags=["Issues"],
+                       parameters=[INCLUDE_ARCHIVED_PARAMETER]),
     create=extend_schema(summary="Create an issue", tags=["Issues"]),
-    retrieve=extend_schema(summary="Get issue details", tags=["Issues"]),
-    update=extend_schema(summary="Update an issue", tags=["Issues"]),
+    retrieve=extend_schema(summary="Get issue details", tags=["Issues"],
+                           parameters=[INCLUDE_ARCHIVED_PARAMETER]),
+    update=extend_schema(summary="Update an issue", tags=["Issues"],
+                         parameters=[IF_MATCH_PARAMETER],
+                         responses={200: IssueSerializer,
+                                    412: VERSION_CONFLICT_RESPONSE}),
+    partial_update=extend_schema(summary="Partially update an issue",
+                                 tags=["Issues"],
+                                 parameters=[IF_MATCH_PARAMETER],
+                                 responses={200: IssueSerializer,
+                                            412: VERSION_CONFLICT_RESPONSE}),
     destroy=extend_schema(summary="Delete an issue", tags=["Issues"]),
+    board=extend_schema(summary="Issues board by status", tags=["Issues"],
+                        parameters=[
+                            OpenApiParameter(
+                                'status', str,
+                                enum=IssueBoardPagination.columns,
+                                description="Column to page through"),
+                            OpenApiParameter(
+                                'cursor', str, description="Cursor of the "
+                                                           "next link of a "
+                                                           "column"),
+                            OpenApiParameter(
+                                'page_size', int,
+                                description="Issues per column")],
+                        responses={200: IssueBoardSerializer}),
 )
-class IssueViewSet(ModelViewSet):
+class IssueViewSet(IdempotentPostMixin, VersionedUpdateMixin, ModelViewSet):
     """ ViewSet for viewing and editing issue """
-    http_method_names = ['get', 'post', 'put', 'delete']
+    http_method_names = ['get', 'post', 'put', 'patch', 'delete']
     serializer_class = IssueSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsAuthorOrContributor]
 
     def get_queryset(self):
         """ Restrict the queryset based on action """
+        return self.project_issues(Issue)
+
+    def project_issues(self, model):
+        """ Issues of the URL project visible to the user, live with Issue
+            or archived with ArchivedIssue """
         project_id = self.kwargs.get('project_id')
         if not project_id:
-            return Issue.objects.none()
+            return model.objects.none()
 
-        return (Issue.objects
+        return (model.objects
                 .filter(project__id=project_id,
-                        project__contributors=self.request.user)
+                        project__contributors=self.request.user,
+                        project__deleted_at__isnull=True)
                 .select_related('author', 'assigned_to', 'project')
                 .prefetch_related('comments'))
 
-    def get_permissions(self):
-        """ Return permissions based on action """
-        if self.action in ['update', 'partial_update', 'destroy']:
-            permission_classes = [IsAuthenticated, IsAuthorOrContributor]
+    def list(self, request, *args, **kwargs):
+        """ Live issues, then the archived ones with ?include_archived=true.
+            Pages of live issues do not read the archive table. An empty
+            page is checked against the project, to answer 404 for a missing
+            or deleted project.
+        """
+        response = self.list_issues(request, *args, **kwargs)
+        data = response.data
+        if self.action == 'board':
+            empty = not any(column['results'] for column in data.values())
         else:
-            permission_classes = [IsAuthenticated]
-        return [permission() for permission in permission_classes]
+            empty = not (data['results'] if isinstance(data, dict) else data)
+        if empty and not Project.objects.filter(
+                pk=kwargs['project_id']).exists():
+            raise NotFound()
+        return response
+
+    def list_issues(self, request, *args, **kwargs):
+        if self.action != 'list' or not include_archived(request):
+            return super().list(request, *args, **kwargs)
+
+        issues = ChainedQuerySets(
+            self.filter_queryset(self.get_queryset()).order_by('id'),
+            self.project_issues(ArchivedIssue).order_by('id'))
+        page = self.paginate_queryset(issues)
+        if page is None:
+            return Response(self.get_serializer(issues[:], many=True).data)
+        return self.get_paginated_response(
+            self.get_serializer(page, many=True).data)
+
+    def get_object(self):
+        """ Look the issue up in the archive too with
+            ?include_archived=true """
+        try:
+            return super().get_object()
+        except Http404:
+            if not include_archived(self.request):
+                raise
+        issue = get_object_or_404(self.project_issues(ArchivedIssue),
+                                  pk=self.kwargs['pk'])
+        self.check_object_permissions(self.request, issue)
+        return issue
+
+    @action(detail=False, pagination_class=IssueBoardPagination)
+    def board(self, request, *args, **kwargs):
+        """ First page and count of each status column """
+        return self.list(request, *args, **kwargs)
+
+    def get_project(self):
+        """ Return the project of the URL with the membership of the caller
+            and of the requested assignee, resolved by a single query.
+            The memberships are kept in project.known_members as
+            {user id: is contributor}.
+        """
+        if getattr(self, '_project', None) is not None:
+            return self._project
+
+        user_ids = [self.request.user.pk]
+        try:
+            assignee_id = int(self.request.data.get('assigned_to'))
+            if assignee_id != self.request.user.pk:
+                user_ids.append(assignee_id)
+        except (AttributeError, TypeError, ValueError):
+            pass
+
+        members = Project.contributors.through.objects.filter(
+            project_id=OuterRef('pk'))
+        project = get_object_or_404(
+            Project.objects.annotate(**{
+                f'member_{index}': Exists(members.filter(customuser_id=pk))
+                for index, pk in enumerate(user_ids)}),
+            id=self.kwargs['project_id'])
+        project.known_members = {
+            pk: getattr(project, f'member_{index}')
+            for index, pk in enumerate(user_ids)}
+        self._project = project
+        return project
 
     def get_serializer_context(self):
-        """ Project injection to serializer for validation (create) """
+        """ Project injection to serializer for validation (writes) """
         context = super().get_serializer_context()
-        project_id = self.kwargs.get('project_id')
-        if project_id:
-            try:
-                context['project'] = get_object_or_404(Project, id=project_id)
-            except Project.DoesNotExist:
-                context['project'] = None
+        if (self.kwargs.get('project_id')
+                and self.action in ('create', 'update', 'partial_update')):
+            context['project'] = self.get_project()
         return context
 
     def perform_create(self, serializer):
         """ Create a new issue with an author automatically"""
-        project = self.get_serializer_context().get("project")
-        if project is None:
-            raise NotFound("Project does not exist")
-
-        if not project.contributors.filter(pk=self.request.user.pk).exists():
+        project = self.get_project()
+        if not project.known_members[self.request.user.pk]:
             raise PermissionDenied(
                 "You are not a contributor to this project."
             )
         serializer.save(author=self.request.user, project=project)
 
 
+ISSUE_BATCH_RESPONSE = inline_serializer(
+    name='IssueBatchResponse',
+    fields={
+        'results': IssueSerializer(many=True),
+        'missing': serializers.ListField(child=serializers.IntegerField()),
+    },
+)
+
+
+@extend_schema_view(
+    get=extend_schema(summary="Get a batch of issues", tags=["Issues"],
+                      parameters=[OpenApiParameter(
+                          'ids', str, description="Comma separated issue "
+                                                  "ids")],
+                      responses={200: ISSUE_BATCH_RESPONSE}),
+    post=extend_schema(summary="Get a batch of issues", tags=["Issues"],
+                       request=IssueBatchSerializer,
+                       responses={200: ISSUE_BATCH_RESPONSE}),
+)
+class IssueBatchView(GenericAPIView):
+    """ Fetch issues of any project of the user by their ids at once """
+    serializer_class = IssueSerializer
+    pagination_class = None
+
+    def get_queryset(self):
+        """ Same restriction as IssueViewSet, across the user projects """
+        return (Issue.objects
+                .filter(project__contributors=self.request.user,
+                        project__deleted_at__isnull=True)
+                .select_related('author', 'assigned_to', 'project')
+                .prefetch_related('comments'))
+
+    def get(self, request):
+        ids = [value for value in request.query_params.get('ids', '')
+               .split(',') if value]
+        return self.batch({'ids': ids})
+
+    def post(self, request):
+        return self.batch(request.data)
+
+    def batch(self, data):
+        """ Return the found issues in the requested order, and the ids
+            that do not exist or are not visible to the user """
+        ids_serializer = IssueBatchSerializer(data=data)
+        ids_serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(ids_serializer.validated_data['ids']))
+
+        issues = self.get_queryset().in_bulk(ids)
+        serializer = self.get_serializer(
+            [issues[pk] for pk in ids if pk in issues], many=True)
+        return Response({
+            'results': serializer.data,
+            'missing': [pk for pk in ids if pk not in issues],
+        })
+
+
 @extend_schema_view(
-    list=extend_schema(summary="Comments list", tags=["Comments"]),
+    list=extend_schema(summary="Comments list", tags=["Comments"],
+                       parameters=[INCLUDE_ARCHIVED_PARAMETER]),
     create=extend_schema(summary="Create a comment", tags=["Comments"]),
-    retrieve=extend_schema(summary="Get comment details", tags=["Comments"]),
-    update=extend_schema(summary="Update a comment", tags=["Comments"]),
+    retrieve=extend_schema(summary="Get comment details", tags=["Comments"],
+                           parameters=[INCLUDE_ARCHIVED_PARAMETER]),
+    update=extend_schema(summary="Update a comment", tags=["Comments"],
+                         parameters=[IF_MATCH_PARAMETER],
+                         responses={200: CommentSerializer,
+                                    412: VERSION_CONFLICT_RESPONSE}),
+    partial_update=extend_schema(summary="Partially update a comment",
+                                 tags=["Comments"],
+                                 parameters=[IF_MATCH_PARAMETER],
+                                 responses={200: CommentSerializer,
+                                            412: VERSION_CONFLICT_RESPONSE}),
     destroy=extend_schema(summary="Delete a comment", tags=["Comments"]),
 )
-class CommentViewSet(ModelViewSet):
+class CommentViewSet(IdempotentPostMixin, VersionedUpdateMixin,
+                     ModelViewSet):
     """ ViewSet for viewing and editing comment """
-    http_method_names = ['get', 'post', 'put', 'delete']
+    http_method_names = ['get', 'post', 'put', 'patch', 'delete']
     serializer_class = CommentSerializer
+    pagination_class = CommentThreadPagination
+    throttle_scope = 'comments'
     lookup_field = "pk"
-
-    def get_permissions(self):
-        """ Return permissions based on action """
-        if self.action in ['update', 'partial_update', 'destroy']:
-            permission_classes = [IsAuthenticated, IsAuthorOrContributor]
-        else:
-            permission_classes = [IsAuthenticated]
-        return [permission() for permission in permission_classes]
+    permission_classes = [IsAuthenticated, IsAuthorOrContributor]
 
     def get_queryset(self):
-        """ Restrict the queryset based on action """
+        """ Restrict the queryset based on action, the comments of an
+            archived issue are read with ?include_archived=true """
         project_id = self.kwargs.get('project_id')
         issue_id = self.kwargs.get('issue_id')
-        return (Comment.objects
+        model = Comment
+        if include_archived(self.request) and ArchivedIssue.objects.filter(
+                pk=issue_id, project_id=project_id).exists():
+            model = ArchivedComment
+        return (model.objects
                 .filter(
                     issue__id=issue_id,
                     issue__project__id=project_id,
-                    issue__project__contributors=self.request.user)
+                    issue__project__contributors=self.request.user,
+                    issue__project__deleted_at__isnull=True)
                 .select_related('author', 'issue', 'issue__project'))
 
     def perform_create(self, serializer):
         """ Create a new comment with author as automatically """
         issue_id = self.kwargs.get('issue_id')
-        issue = get_object_or_404(Issue, id=issue_id)
+        issue = get_object_or_404(Issue, id=issue_id,
+                                  project__deleted_at__isnull=True)
         if not (issue.project.contributors
                 .filter(pk=self.request.user.pk)
                 .exists()):